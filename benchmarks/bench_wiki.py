@@ -0,0 +1,262 @@
+"""
+Offline benchmarks for Wiki/Wikibeta game detection and command dispatch.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_wiki
+    python -m benchmarks.bench_wiki --json bench.json
+    python -m benchmarks.bench_wiki --baseline bench.json
+
+Reports detection throughput, per-phase latency percentiles and the number
+of simulated API calls per command. With `--baseline`, exits non-zero if
+throughput drops or API calls per command rise compared to a saved run.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+
+from benchmarks.corpus import KINDS, build_corpus
+from benchmarks.fakes import (
+    ApiRecorder,
+    FakeBot,
+    FakeChannel,
+    FakeConfig,
+    FakeContext,
+    FakeGuild,
+    FakeMessage,
+    FakeReference,
+)
+from wiki.games import ALIAS_TO_ROLE, ALLOWED_ROLES, ROLE_NAME_TO_CHANNEL_ID
+
+
+def percentiles(samples):
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+class Phases:
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, name, seconds):
+        self.samples.setdefault(name, []).append(seconds * 1e6)
+
+    def summary(self):
+        return {name: percentiles(values) for name, values in self.samples.items()}
+
+
+class World:
+    """
+    One fake guild with every game role and channel, plus a staff member
+    who runs the commands and a regular member who gets replied to.
+    """
+
+    def __init__(self, api_latency=0.0):
+        from wiki.wiki_cog import Wiki
+        from wikibeta.wikibeta_cog import Wikibeta
+
+        FakeConfig.patch()
+        self.api = ApiRecorder(latency=api_latency)
+        role_names = sorted(set(ALIAS_TO_ROLE.values()) | set(ALLOWED_ROLES))
+        channel_ids = sorted(set(ROLE_NAME_TO_CHANNEL_ID.values()))
+        self.guild = FakeGuild(self.api, role_names, channel_ids)
+        self.general = FakeChannel(self.api, self.guild, "general", 1)
+        self.guild._channels[1] = self.general
+        self.staff = self.guild.add_member("staff", ["Advisors"])
+        self.member = self.guild.add_member("member")
+        self.bot = FakeBot()
+        self.wiki = Wiki(self.bot)
+        self.wikibeta = Wikibeta(self.bot)
+        self.bot.cogs = {"Wiki": self.wiki, "Wikibeta": self.wikibeta}
+        # Queued lfg pings go out straight away, so each command's calls land in its own sample.
+        self.wiki.outbound.window = 0
+        self.wiki.outbound.rate = self.wiki.outbound.burst = 1e6
+
+    def context(self, text, channel=None, resolved=False):
+        channel = channel or self.general
+        target = FakeMessage(self.api, channel, self.member, text)
+        reference = FakeReference(target, resolved=target if resolved else None)
+        command = FakeMessage(self.api, channel, self.staff, "-lfg", reference=reference)
+        return FakeContext(self.bot, command)
+
+    async def drain(self, cog):
+        while len(cog.background) or len(getattr(cog, "outbound", ())):
+            await asyncio.sleep(0)
+
+
+def bench_detection(corpus, repeats):
+    """
+    Messages/sec for the pure detection path, per cog normalization and per
+    message kind. Takes the best of `repeats` runs to damp scheduler noise.
+    """
+    from wiki.games import GameRegistry
+
+    games = GameRegistry()
+    normalizers = {
+        "wiki": lambda text: text.lower().replace(" ", ""),
+        "wikibeta": lambda text: text.lower(),
+    }
+    results = {}
+    for cog_name, normalize in normalizers.items():
+        prepared = [(kind, normalize(text)) for kind, text in corpus]
+        best = 0.0
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _, text in prepared:
+                games.detect(text)
+            elapsed = time.perf_counter() - start
+            best = max(best, len(prepared) / elapsed)
+        per_kind = {}
+        for kind in KINDS:
+            subset = [text for k, text in prepared if k == kind]
+            start = time.perf_counter()
+            for text in subset:
+                games.detect(text)
+            per_kind[kind] = len(subset) / (time.perf_counter() - start)
+        hits = sum(1 for _, text in prepared if games.detect(text))
+        results[cog_name] = {"msgs_per_sec": best, "per_kind_msgs_per_sec": per_kind, "hit_rate": hits / len(prepared)}
+    return results
+
+
+async def bench_commands(corpus, samples, api_latency, seed):
+    world = World(api_latency=api_latency)
+    rng = random.Random(seed)
+    mapped_channels = [c for cid, c in world.guild._channels.items() if cid != 1]
+    phases = Phases()
+    calls = {}
+    picked = rng.sample(corpus, min(samples, len(corpus)))
+
+    async def run(name, cog, make_ctx, invoke):
+        for kind, text in picked:
+            ctx = make_ctx(kind, text)
+            world.api.reset()
+            start = time.perf_counter()
+            await invoke(cog, ctx)
+            await world.drain(cog)
+            phases.add(f"{name}.total", time.perf_counter() - start)
+            calls.setdefault(name, []).append(world.api.total())
+
+    def lfg_ctx(kind, text):
+        channel = rng.choice(mapped_channels) if rng.random() < 0.3 else world.general
+        return world.context(text, channel=channel)
+
+    await run("wiki.lfg", world.wiki, lfg_ctx, lambda cog, ctx: cog.lfg.callback(cog, ctx))
+    await run("wikibeta.lfg", world.wikibeta, lfg_ctx, lambda cog, ctx: cog.lfg.callback(cog, ctx))
+    rule_queries = [str(n) for n in range(1, 11)] + ["nsfw", "invites", "english", "channel", "spam"]
+    await run("wiki.rule", world.wiki, lfg_ctx, lambda cog, ctx: cog.rule.callback(cog, ctx, query=rng.choice(rule_queries)))
+    await run("wiki.send_reply", world.wiki, lfg_ctx, lambda cog, ctx: cog.send_reply(ctx, "hello"))
+
+    # Passive detection on ordinary chat, with the cooldowns off so every match is nudged.
+    world.wiki.passive_channels[world.guild.id] = frozenset({world.general.id})
+    world.wiki.passive.channel_cooldown = world.wiki.passive.user_cooldown = 0
+
+    def chat_ctx(kind, text):
+        return FakeContext(world.bot, FakeMessage(world.api, world.general, world.member, text))
+
+    await run("wiki.on_message", world.wiki, chat_ctx, lambda cog, ctx: cog.on_message(ctx.message))
+
+    # Per-phase timings of the building blocks lfg is made of.
+    index = world.wiki.guild_index.get(world.guild)
+    for kind, text in picked:
+        ctx = world.context(text)
+        world.api.reset()
+        start = time.perf_counter()
+        await world.wiki.delete_and_check(ctx)
+        phases.add("phase.delete_and_check", time.perf_counter() - start)
+        await world.drain(world.wiki)
+
+        start = time.perf_counter()
+        replied = await world.wiki.references.resolve(ctx.message)
+        phases.add("phase.reference_resolve", time.perf_counter() - start)
+
+        content = replied.content.lower().replace(" ", "")
+        start = time.perf_counter()
+        role_name = world.wiki.games.detect(content)
+        phases.add("phase.detect", time.perf_counter() - start)
+
+        if role_name:
+            start = time.perf_counter()
+            index.role(role_name)
+            index.channel_for_role(role_name)
+            phases.add("phase.role_resolve", time.perf_counter() - start)
+
+    api_calls = {name: {"mean": statistics.mean(values), "max": max(values)} for name, values in calls.items()}
+    return phases.summary(), api_calls
+
+
+def print_report(report):
+    print("Detection throughput")
+    for cog_name, data in report["detection"].items():
+        kinds = ", ".join(f"{k} {v:,.0f}/s" for k, v in data["per_kind_msgs_per_sec"].items())
+        print(f"  {cog_name:9} {data['msgs_per_sec']:>12,.0f} msgs/s  hit rate {data['hit_rate']:.0%}  ({kinds})")
+    print("\nLatency (µs)")
+    for name, pct in sorted(report["latency_us"].items()):
+        print(f"  {name:26} p50 {pct['p50']:>9.1f}  p95 {pct['p95']:>9.1f}  p99 {pct['p99']:>9.1f}")
+    print("\nSimulated API calls per command")
+    for name, data in sorted(report["api_calls"].items()):
+        print(f"  {name:26} mean {data['mean']:.2f}  max {data['max']}")
+
+
+def compare(report, baseline, tolerance):
+    """
+    Return a list of regressions of `report` against `baseline`.
+    """
+    problems = []
+    for cog_name, data in baseline.get("detection", {}).items():
+        now = report["detection"].get(cog_name, {}).get("msgs_per_sec", 0.0)
+        if now < data["msgs_per_sec"] * (1 - tolerance):
+            problems.append(f"{cog_name} detection {now:,.0f} msgs/s < baseline {data['msgs_per_sec']:,.0f}")
+    for name, data in baseline.get("api_calls", {}).items():
+        now = report["api_calls"].get(name, {}).get("mean")
+        if now is not None and now > data["mean"] + 1e-9:
+            problems.append(f"{name} uses {now:.2f} API calls per command, baseline {data['mean']:.2f}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus-size", type=int, default=2000)
+    parser.add_argument("--samples", type=int, default=400, help="Commands to run per benchmarked command.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--api-latency", type=float, default=0.0, help="Fake seconds added to each API call.")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", help="Write the report to this file.")
+    parser.add_argument("--baseline", help="Compare against a report written with --json.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed throughput drop vs the baseline.")
+    args = parser.parse_args(argv)
+    # Registry problems are logged on every cog construction; keep the report readable.
+    logging.getLogger("red").setLevel(logging.ERROR)
+
+    corpus = build_corpus(args.corpus_size, args.seed)
+    report = {"detection": bench_detection(corpus, args.repeats)}
+    latency, api_calls = asyncio.run(bench_commands(corpus, args.samples, args.api_latency, args.seed))
+    report["latency_us"] = latency
+    report["api_calls"] = api_calls
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fp:
+            problems = compare(report, json.load(fp), args.tolerance)
+        if problems:
+            print("\nRegressions:\n  " + "\n  ".join(problems))
+            return 1
+        print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Deterministic corpus of chat messages for the detection benchmarks.
+"""
+import random
+
+from wiki.games import ALIAS_TO_ROLE
+
+FILLER = (
+    "anyone", "up", "for", "some", "tonight", "after", "work", "kids", "are", "asleep",
+    "we", "need", "one", "more", "for", "a", "squad", "who", "wants", "to", "play",
+    "later", "lol", "honestly", "that", "last", "match", "was", "wild", "brb", "coffee",
+)
+EMOJI = ("🎮", "🔥", "😂", "👀", "💀", "🙏", "🍕", "🧙", "⚔️", "🏆")
+KINDS = ("short", "long", "emoji", "code", "nomatch")
+
+
+def _words(rng, count):
+    return [rng.choice(FILLER) for _ in range(count)]
+
+
+def make_message(rng, kind, aliases):
+    alias = rng.choice(aliases)
+    if kind == "short":
+        return f"{alias} {rng.choice(('tonight?', 'anyone?', 'later?', 'rn'))}"
+    if kind == "long":
+        words = _words(rng, rng.randint(60, 160))
+        words.insert(rng.randrange(len(words)), alias)
+        return " ".join(words)
+    if kind == "emoji":
+        words = _words(rng, rng.randint(5, 20))
+        words.insert(rng.randrange(len(words)), alias)
+        return " ".join(f"{w} {rng.choice(EMOJI)}" for w in words)
+    if kind == "code":
+        body = "\n".join(" ".join(_words(rng, 6)) for _ in range(rng.randint(3, 10)))
+        return f"my config for {alias} is broken:\n```ini\n{body}\n```"
+    return " ".join(_words(rng, rng.randint(3, 40)))
+
+
+def build_corpus(size=2000, seed=1234):
+    """
+    Return a list of `(kind, text)` pairs, evenly spread across KINDS.
+    """
+    rng = random.Random(seed)
+    aliases = sorted(ALIAS_TO_ROLE)
+    return [(KINDS[i % len(KINDS)], make_message(rng, KINDS[i % len(KINDS)], aliases)) for i in range(size)]
@@ -0,0 +1,211 @@
+"""
+Local stand-in for the karaoke API, for load tests.
+
+Serves `/search` and `/download` with the same JSON shapes the karaoke cog
+parses, with configurable latency, jitter, error rate and download time.
+With `async_downloads`, `/download` answers right away with a `job_id`
+and `/status` reports the download's progress until it finishes.
+Run it on its own to poke at the cog by hand:
+
+    python -m benchmarks.fake_karaoke_api --port 8765 --latency 0.2 --error-rate 0.05 --async-downloads
+
+or start it in-process with `FakeKaraokeServer`.
+"""
+import argparse
+import asyncio
+import random
+import time
+import zlib
+from collections import Counter
+
+from aiohttp import web
+
+from karaoke.api import API_TOKEN
+
+
+class FakeKaraokeBehavior:
+    """
+    Knobs for the fake server. Latencies are in seconds; `jitter` is the
+    fraction of the latency that is randomly added or removed.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.5,
+        error_rate: float = 0.0,
+        download_latency: float = 0.5,
+        slow_download_rate: float = 0.0,
+        slow_download_latency: float = 5.0,
+        results: int = 10,
+        async_downloads: bool = False,
+        token: str = API_TOKEN,
+        seed: int = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.download_latency = download_latency
+        self.slow_download_rate = slow_download_rate
+        self.slow_download_latency = slow_download_latency
+        self.results = results
+        self.async_downloads = async_downloads
+        self.token = token
+        self.rng = random.Random(seed)
+
+    def delay(self, base):
+        return max(0.0, base * (1 + self.jitter * self.rng.uniform(-1, 1)))
+
+
+class FakeKaraokeServer:
+    """
+    The fake API on 127.0.0.1. Use as `async with FakeKaraokeServer(behavior) as server:`
+    and point the client at `server.url`.
+    """
+
+    def __init__(self, behavior: FakeKaraokeBehavior = None, host: str = "127.0.0.1", port: int = 0):
+        self.behavior = behavior or FakeKaraokeBehavior()
+        self.host = host
+        self.port = port
+        self.stats = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # job id -> (started, duration, ok) for async downloads.
+        self.downloads = {}
+        self._runner = None
+        self.app = web.Application()
+        self.app.router.add_post("/api/search", self.search)
+        self.app.router.add_post("/api/download", self.download)
+        self.app.router.add_post("/api/status", self.status)
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/api"
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Port 0 means "pick a free one"; read back what we got.
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _handle(self, request, endpoint, base_latency, answer, error_rate=None):
+        self.stats[f"{endpoint}.requests"] += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if request.headers.get("Authorization") != f"Bearer {self.behavior.token}":
+                self.stats[f"{endpoint}.unauthorized"] += 1
+                return web.json_response({"error": "Unauthorized"}, status=401)
+            try:
+                payload = await request.json()
+            except ValueError:
+                return web.json_response({"error": "Invalid JSON"}, status=400)
+            await asyncio.sleep(self.behavior.delay(base_latency))
+            if error_rate is None:
+                error_rate = self.behavior.error_rate
+            if self.behavior.rng.random() < error_rate:
+                self.stats[f"{endpoint}.errors"] += 1
+                return web.json_response({"error": "Upstream exploded (fake)"}, status=500)
+            return answer(payload)
+        finally:
+            self.in_flight -= 1
+
+    async def search(self, request):
+        def answer(payload):
+            song = payload.get("song")
+            if not song:
+                return web.json_response({"error": "Missing song"}, status=400)
+            key = zlib.crc32(song.encode())
+            results = [
+                {
+                    "title": f"{song} (Karaoke Version {n})",
+                    "thumbnail": f"https://img.example.invalid/{key}/{n}.jpg",
+                    "url": f"https://video.example.invalid/watch?v={key}-{n}",
+                }
+                for n in range(1, self.behavior.results + 1)
+            ]
+            return web.json_response({"results": results})
+
+        return await self._handle(request, "search", self.behavior.latency, answer)
+
+    async def download(self, request):
+        behavior = self.behavior
+        slow = behavior.rng.random() < behavior.slow_download_rate
+        if slow:
+            self.stats["download.slow"] += 1
+        latency = behavior.delay(behavior.slow_download_latency if slow else behavior.download_latency)
+
+        def answer(payload):
+            if not payload.get("video_url"):
+                return web.json_response({"error": "Missing video_url"}, status=400)
+            if behavior.async_downloads:
+                job_id = f"job-{len(self.downloads) + 1}"
+                ok = behavior.rng.random() >= behavior.error_rate
+                self.downloads[job_id] = (time.monotonic(), latency, ok)
+                return web.json_response({"message": "Download started.", "job_id": job_id})
+            return web.json_response({"message": "Download triggered successfully."})
+
+        # In async mode the trigger is as quick as a search; the download runs behind /status.
+        return await self._handle(request, "download", behavior.latency if behavior.async_downloads else latency, answer)
+
+    async def status(self, request):
+        def answer(payload):
+            download = self.downloads.get(payload.get("job_id"))
+            if download is None:
+                return web.json_response({"error": "Unknown job"}, status=404)
+            started, duration, ok = download
+            done = time.monotonic() - started
+            if done < duration:
+                return web.json_response({"status": "downloading", "progress": int(100 * done / duration)})
+            if not ok:
+                return web.json_response({"status": "failed", "message": "Video unavailable (fake)"})
+            return web.json_response({"status": "done", "progress": 100, "message": "Download complete."})
+
+        # Status checks are cheap and never fail at random; failures are part of the download itself.
+        return await self._handle(request, "status", 0.0, answer, error_rate=0.0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per search.")
+    parser.add_argument("--jitter", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 500.")
+    parser.add_argument("--download-latency", type=float, default=0.5)
+    parser.add_argument("--slow-download-rate", type=float, default=0.0)
+    parser.add_argument("--slow-download-latency", type=float, default=5.0)
+    parser.add_argument("--results", type=int, default=10)
+    parser.add_argument("--async-downloads", action="store_true", help="Answer /download with a job ID and serve /status.")
+    args = parser.parse_args(argv)
+    behavior = FakeKaraokeBehavior(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        download_latency=args.download_latency,
+        slow_download_rate=args.slow_download_rate,
+        slow_download_latency=args.slow_download_latency,
+        results=args.results,
+        async_downloads=args.async_downloads,
+    )
+    server = FakeKaraokeServer(behavior, args.host, args.port)
+    print(f"Fake karaoke API on {server.url} (Ctrl+C to stop)")
+    web.run_app(server.app, host=args.host, port=args.port, print=None, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+Lightweight stand-ins for the discord.py and Red objects the cogs touch.
+
+Every coroutine that would be a REST call in production goes through
+`ApiRecorder.call`, which counts it by name and can add a fixed fake
+latency, so benchmarks can report API calls per command without a
+Discord connection.
+"""
+import asyncio
+import itertools
+from collections import Counter
+
+_ids = itertools.count(10**17)
+
+
+def next_id():
+    return next(_ids)
+
+
+class ApiRecorder:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.counts = Counter()
+
+    async def call(self, name):
+        self.counts[name] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        else:
+            await asyncio.sleep(0)
+
+    def total(self):
+        return sum(self.counts.values())
+
+    def reset(self):
+        self.counts.clear()
+
+
+class FakeRole:
+    def __init__(self, name, position=1, role_id=None):
+        self.id = role_id or next_id()
+        self.name = name
+        self.position = position
+        self.mention = f"<@&{self.id}>"
+
+    def __eq__(self, other):
+        return isinstance(other, FakeRole) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f"<FakeRole {self.name!r}>"
+
+
+class FakeMember:
+    def __init__(self, api, guild, name, roles=()):
+        self.api = api
+        self.id = next_id()
+        self.name = name
+        self.display_name = name
+        self.guild = guild
+        self.roles = list(roles)
+        self.mention = f"<@{self.id}>"
+        self.bot = False
+        self.timed_out_until = None
+
+    async def add_roles(self, *roles, reason=None):
+        await self.api.call("add_roles")
+        for role in roles:
+            if role not in self.roles:
+                self.roles.append(role)
+
+    async def timeout(self, until, reason=None):
+        await self.api.call("timeout")
+        self.timed_out_until = until
+
+    async def create_dm(self):
+        return FakeChannel(self.api, None, f"dm-{self.name}")
+
+    async def send(self, *args, **kwargs):
+        channel = await self.create_dm()
+        return await channel.send(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<FakeMember {self.name!r}>"
+
+
+class FakeReference:
+    def __init__(self, message, resolved=None, cached=None):
+        self.message_id = message.id
+        self.channel_id = message.channel.id
+        self.resolved = resolved
+        self.cached_message = cached
+
+
+class FakeMessage:
+    def __init__(self, api, channel, author, content="", reference=None, **kwargs):
+        self.api = api
+        self.id = next_id()
+        self.channel = channel
+        self.author = author
+        self.content = content
+        self.reference = reference
+        self.guild = channel.guild if channel else None
+        self.kwargs = kwargs
+        channel.history[self.id] = self
+
+    async def delete(self, *, delay=None):
+        await self.api.call("delete")
+
+    async def reply(self, *args, **kwargs):
+        await self.api.call("reply")
+        return FakeMessage(self.api, self.channel, None, args[0] if args else "", **kwargs)
+
+    async def edit(self, **kwargs):
+        await self.api.call("edit")
+        self.kwargs.update(kwargs)
+        return self
+
+    async def add_reaction(self, emoji):
+        await self.api.call("add_reaction")
+
+
+class FakeChannel:
+    def __init__(self, api, guild, name, channel_id=None):
+        self.api = api
+        self.id = channel_id or next_id()
+        self.guild = guild
+        self.name = name
+        self.mention = f"<#{self.id}>"
+        self.history = {}
+
+    async def send(self, *args, **kwargs):
+        await self.api.call("send")
+        return FakeMessage(self.api, self, None, args[0] if args else "", **kwargs)
+
+    async def fetch_message(self, message_id):
+        await self.api.call("fetch_message")
+        return self.history[message_id]
+
+    def typing(self):
+        return _NullAsyncContext()
+
+    def get_partial_message(self, message_id):
+        return self.history.get(message_id) or FakeMessage(self.api, self, None)
+
+
+class FakeGuild:
+    def __init__(self, api, role_names, channel_ids):
+        self.api = api
+        self.id = next_id()
+        self.name = "Fake PA"
+        self.roles = [FakeRole(name, position=pos) for pos, name in enumerate(role_names, start=1)]
+        self._channels = {cid: FakeChannel(api, self, f"channel-{cid}", cid) for cid in channel_ids}
+        self.owner_id = next_id()
+        self.members = []
+        self.me = None
+
+    def get_channel(self, channel_id):
+        return self._channels.get(channel_id)
+
+    def get_role(self, role_id):
+        for role in self.roles:
+            if role.id == role_id:
+                return role
+        return None
+
+    def get_member(self, member_id):
+        for member in self.members:
+            if member.id == member_id:
+                return member
+        return None
+
+    def add_member(self, name, role_names=()):
+        roles = [role for role in self.roles if role.name in role_names]
+        member = FakeMember(self.api, self, name, roles)
+        self.members.append(member)
+        return member
+
+
+class FakeContext:
+    def __init__(self, bot, message):
+        self.bot = bot
+        self.message = message
+        self.author = message.author
+        self.guild = message.guild
+        self.channel = message.channel
+        self.invoked_subcommand = None
+        self.clean_prefix = "-"
+
+    async def send(self, *args, **kwargs):
+        return await self.channel.send(*args, **kwargs)
+
+    async def send_help(self):
+        await self.channel.send("help")
+
+    def typing(self):
+        return _NullAsyncContext()
+
+
+class FakeBot:
+    def __init__(self):
+        self.cogs = {}
+        self.views = []
+        self.dynamic_items = []
+        self.users = {}
+
+    def get_cog(self, name):
+        return self.cogs.get(name)
+
+    def get_user(self, user_id):
+        return self.users.get(user_id)
+
+    def add_view(self, view, *, message_id=None):
+        self.views.append(view)
+
+    def add_dynamic_items(self, *items):
+        self.dynamic_items.extend(items)
+
+    def remove_dynamic_items(self, *items):
+        self.dynamic_items = [item for item in self.dynamic_items if item not in items]
+
+    async def wait_until_red_ready(self):
+        return None
+
+    async def cog_disabled_in_guild(self, cog, guild):
+        return False
+
+    async def ignored_channel_or_guild(self, ctx_or_message):
+        return True
+
+
+class _NullAsyncContext:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeValue:
+    def __init__(self, store, key, default):
+        self._store = store
+        self._key = key
+        self._default = default
+
+    def __call__(self):
+        return _FakeValueContext(self)
+
+    async def _get(self):
+        value = self._store.get(self._key, self._default)
+        return value.copy() if isinstance(value, (dict, list)) else value
+
+    async def set(self, value):
+        self._store[self._key] = value
+
+    async def clear(self):
+        self._store.pop(self._key, None)
+
+
+class _FakeValueContext:
+    """
+    Like Red's value context: await it for a copy, or `async with` it to edit and save.
+    """
+
+    def __init__(self, value):
+        self._value = value
+        self._current = None
+
+    def __await__(self):
+        return self._value._get().__await__()
+
+    async def __aenter__(self):
+        self._current = await self._value._get()
+        return self._current
+
+    async def __aexit__(self, *exc):
+        await self._value.set(self._current)
+        return False
+
+
+class _FakeGroup:
+    def __init__(self, store, defaults):
+        self._store = store
+        self._defaults = defaults
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _FakeValue(self._store, name, self._defaults.get(name))
+
+    async def all(self):
+        merged = dict(self._defaults)
+        merged.update(self._store)
+        return merged
+
+    async def clear(self):
+        self._store.clear()
+
+
+class FakeConfig:
+    """
+    In-memory subset of Red's Config used by the cogs.
+
+    Install with `FakeConfig.patch()` before constructing a cog so
+    `Config.get_conf` doesn't need a Red data directory.
+    """
+
+    def __init__(self):
+        self._defaults = {}
+        self._data = {}
+
+    @classmethod
+    def get_conf(cls, cog_instance=None, identifier=None, force_registration=False, **kwargs):
+        return cls()
+
+    @classmethod
+    def patch(cls):
+        from redbot.core import Config
+
+        Config.get_conf = cls.get_conf
+
+    def _register(self, scope, **defaults):
+        self._defaults.setdefault(scope, {}).update(defaults)
+
+    def register_global(self, **defaults):
+        self._register("global", **defaults)
+
+    def register_guild(self, **defaults):
+        self._register("guild", **defaults)
+
+    def register_member(self, **defaults):
+        self._register("member", **defaults)
+
+    def register_channel(self, **defaults):
+        self._register("channel", **defaults)
+
+    def _group(self, scope, *keys):
+        store = self._data.setdefault((scope,) + keys, {})
+        return _FakeGroup(store, self._defaults.get(scope, {}))
+
+    def guild(self, guild):
+        return self._group("guild", guild.id)
+
+    async def all_guilds(self):
+        defaults = self._defaults.get("guild", {})
+        return {
+            keys[1]: {**defaults, **store}
+            for keys, store in self._data.items()
+            if keys[0] == "guild"
+        }
+
+    def member(self, member):
+        return self._group("member", member.guild.id, member.id)
+
+    def channel(self, channel):
+        return self._group("channel", channel.id)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._group("global"), name)
@@ -0,0 +1,305 @@
+import asyncio
+import random
+import time
+from collections import Counter, deque
+
+import aiohttp
+
+API_URL = "https://pak.mulveycreations.com/api"
+API_TOKEN = "jonlivesunderthedesk"
+
+
+class KaraokeAPIError(Exception):
+    """Raised when the karaoke API answers with an error status."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def transient(self):
+        # 5xx and 429 are worth retrying; anything else is the request's fault.
+        return self.status is not None and (self.status >= 500 or self.status == 429)
+
+
+class KaraokeAPIUnavailable(KaraokeAPIError):
+    """Raised when the karaoke API is down or unreachable."""
+
+    def __init__(self, message="The karaoke service is having trouble right now. Please try again in a few minutes."):
+        super().__init__(message)
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated upstream failures.
+
+    Opens after `failure_threshold` consecutive failures. After `reset_timeout`
+    seconds one trial request is let through (half-open): success closes the
+    breaker, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+        self._trial_started = 0.0
+
+    def allow(self):
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state == self.OPEN and now - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._trial_running = False
+        # A trial that never reported back (e.g. cancelled) doesn't block forever.
+        if self.state == self.HALF_OPEN and (
+            not self._trial_running or now - self._trial_started >= self.reset_timeout
+        ):
+            self._trial_running = True
+            self._trial_started = now
+            return True
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._trial_running = False
+
+    def retry_in(self):
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+
+class LatencyTracker:
+    """
+    Latencies of the most recent `size` answered requests.
+    """
+
+    def __init__(self, size: int = 200):
+        self.samples = deque(maxlen=size)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+
+    def percentile(self, pct):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class KaraokeAPI:
+    """
+    Async client for the karaoke API.
+
+    Owns one pooled aiohttp session with keep-alive and explicit connect and
+    read timeouts, so a slow upstream never blocks the event loop. Searches
+    are idempotent, so they get bounded exponential-backoff retries and, when
+    `hedge` is on, a second request if the first runs past the recent p95.
+    Download triggers are never retried. The API answers `/download` only once
+    the download is done, so it gets its own much longer read timeout, and
+    running past it is not held against the upstream. A circuit breaker
+    shared by all endpoints fails fast while the upstream is down.
+    """
+
+    def __init__(
+        self,
+        base_url: str = API_URL,
+        token: str = API_TOKEN,
+        *,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        download_timeout: float = 900.0,
+        max_connections: int = 10,
+        keepalive_timeout: float = 30.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+        hedge: bool = False,
+        hedge_min_samples: int = 20,
+        perf=None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.timeout = aiohttp.ClientTimeout(total=None, connect=connect_timeout, sock_read=read_timeout)
+        # Per-endpoint overrides of the session timeout.
+        self.timeouts = {
+            "/download": aiohttp.ClientTimeout(total=None, connect=connect_timeout, sock_read=download_timeout),
+        }
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = CircuitBreaker()
+        self.latency = {"/search": LatencyTracker(), "/download": LatencyTracker(), "/status": LatencyTracker()}
+        self.stats = Counter()
+        # Optional PerfRegistry; every request attempt is timed into `api.<endpoint>`.
+        self.perf = perf
+        self.session = None
+
+    async def start(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=self.keepalive_timeout)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={"Authorization": f"Bearer {self.token}"},
+            )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _post(self, path, payload):
+        """
+        POST JSON to `path` once and return the decoded body, raising KaraokeAPIError on a non-200 answer.
+        """
+        await self.start()
+        self.stats["requests"] += 1
+        started = time.monotonic()
+        try:
+            timeout = self.timeouts.get(path, self.timeout)
+            async with self.session.post(f"{self.base_url}{path}", json=payload, timeout=timeout) as response:
+                try:
+                    data = await response.json(content_type=None)
+                except ValueError:
+                    data = None
+                self.latency[path].add(time.monotonic() - started)
+                if not isinstance(data, dict):
+                    data = {}
+                if response.status != 200:
+                    raise KaraokeAPIError(data.get("error", "Unknown error"), status=response.status)
+                return data
+        finally:
+            if self.perf is not None:
+                self.perf.observe(f"api.{path.strip('/')}", time.monotonic() - started)
+
+    async def _hedged_post(self, path, payload):
+        """
+        Like `_post`, but races a second request once the first outlives the recent p95.
+        """
+        tracker = self.latency[path]
+        threshold = tracker.percentile(95) if len(tracker) >= self.hedge_min_samples else None
+        first = asyncio.ensure_future(self._post(path, payload))
+        pending = {first}
+        try:
+            if threshold is None:
+                return await first
+            done, _ = await asyncio.wait(pending, timeout=threshold)
+            if done:
+                return first.result()
+            self.stats["hedges"] += 1
+            second = asyncio.ensure_future(self._post(path, payload))
+            pending.add(second)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _call(self, path, payload, *, idempotent):
+        if not self.breaker.allow():
+            self.stats["short_circuited"] += 1
+            raise KaraokeAPIUnavailable()
+        attempts = 1 + (self.retries if idempotent else 0)
+        for attempt in range(attempts):
+            try:
+                if idempotent and self.hedge:
+                    data = await self._hedged_post(path, payload)
+                else:
+                    data = await self._post(path, payload)
+            except KaraokeAPIError as e:
+                if not e.transient:
+                    # The upstream is alive; the request itself was bad.
+                    self.breaker.record_success()
+                    raise
+                last_error = e
+            except asyncio.TimeoutError as e:
+                if path == "/download":
+                    # A slow download says nothing about whether the upstream is up.
+                    self.stats["download_timeouts"] += 1
+                    raise KaraokeAPIError(
+                        "The download is taking longer than expected. It may still finish; try again in a few minutes."
+                    ) from e
+                last_error = e
+            except aiohttp.ClientError as e:
+                last_error = e
+            else:
+                self.breaker.record_success()
+                return data
+            self.stats["failures"] += 1
+            self.breaker.record_failure()
+            if attempt + 1 >= attempts or not self.breaker.allow():
+                break
+            self.stats["retries"] += 1
+            await asyncio.sleep(self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
+        raise KaraokeAPIUnavailable() from last_error
+
+    async def search(self, song):
+        """
+        Return the list of result dicts for `song`.
+        """
+        data = await self._call("/search", {"song": song}, idempotent=True)
+        return data.get("results", [])
+
+    async def download(self, video_url):
+        """
+        Trigger a download and return the API's answer.
+
+        The answer always has a `message`; it also has a `job_id` when the
+        API runs the download in the background and can report its status.
+        """
+        data = await self._call("/download", {"video_url": video_url}, idempotent=False)
+        data.setdefault("message", "Download triggered successfully.")
+        return data
+
+    async def download_status(self, job_id):
+        """
+        Return the API's `status`, `progress` and `message` for a background download.
+        """
+        return await self._call("/status", {"job_id": job_id}, idempotent=True)
+
+    def describe(self):
+        """
+        Return a dict snapshot of breaker state, counters and latency percentiles.
+        """
+        latency = {}
+        for path, tracker in self.latency.items():
+            latency[path] = {f"p{p}": tracker.percentile(p) for p in (50, 95, 99)}
+            latency[path]["samples"] = len(tracker)
+        return {
+            "breaker": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "retry_in": self.breaker.retry_in(),
+            "hedge": self.hedge,
+            "stats": dict(self.stats),
+            "latency": latency,
+        }
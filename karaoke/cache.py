@@ -0,0 +1,87 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+
+def normalize_query(query):
+    """
+    Casefold and collapse whitespace so equivalent searches share a cache entry.
+    """
+    return " ".join(query.casefold().split())
+
+
+class SearchCache:
+    """
+    Bounded TTL + LRU cache for search results with request coalescing.
+
+    Concurrent lookups for the same normalized query share one in-flight
+    upstream call. Failed calls are not cached.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def get(self, query, fetch):
+        """
+        Return cached results for `query`, calling `fetch(query)` on a miss.
+        """
+        key = normalize_query(query)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, results = entry
+            if expires > time.monotonic():
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return results
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch(query))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        # Shielded so one impatient caller can't cancel the shared request.
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, task.result())
+        self._entries.move_to_end(key)
+        self._trim()
+
+    def _trim(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def resize(self, max_entries):
+        self.max_entries = max_entries
+        self._trim()
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import time
+
+from .api import KaraokeAPIError
+from .progress import StatusPoller, parse_progress
+
+log = logging.getLogger("red.Karaoke.jobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+ACTIVE = (QUEUED, RUNNING)
+
+
+class DownloadJob:
+    """
+    One download of one video URL, shared by everyone who asked for it.
+    """
+
+    def __init__(
+        self, job_id, video_url, title=None, status=QUEUED, message=None, requesters=None, created_at=None,
+        remote_id=None, progress=None
+    ):
+        self.id = job_id
+        self.video_url = video_url
+        self.title = title or video_url
+        self.status = status
+        self.message = message
+        self.requesters = list(requesters or [])
+        self.created_at = created_at or time.time()
+        # The API's own job ID while it downloads in the background, and its last reported percentage.
+        self.remote_id = remote_id
+        self.progress = parse_progress(progress)
+
+    @property
+    def active(self):
+        return self.status in ACTIVE
+
+    def to_dict(self):
+        return {
+            "video_url": self.video_url,
+            "title": self.title,
+            "status": self.status,
+            "message": self.message,
+            "requesters": self.requesters,
+            "created_at": self.created_at,
+            "remote_id": self.remote_id,
+            "progress": self.progress,
+        }
+
+    @classmethod
+    def from_dict(cls, job_id, data):
+        return cls(job_id, **data)
+
+
+class DownloadQueue:
+    """
+    Download jobs processed by a fixed pool of workers.
+
+    Requests for a URL that is already queued or running attach to that
+    job instead of starting another download. Job state is written to the
+    cog's global Config (`download_jobs`) on every change, and unfinished
+    jobs are queued again when the cog loads.
+
+    Workers only trigger downloads. When the API answers with a job ID and
+    `status` is given, the job is handed to a `StatusPoller` and the worker
+    moves on; `progress(job)` is called whenever the job's state or
+    percentage changes.
+    """
+
+    def __init__(self, config, download, notify, status=None, progress=None, workers: int = 2, history: int = 50):
+        self.config = config
+        self.download = download
+        self.notify = notify
+        self.progress = progress
+        self.poller = StatusPoller(status, self._on_progress, self._on_remote_finish) if status else None
+        self.worker_count = workers
+        self.history = history
+        self.jobs = {}
+        self._by_url = {}
+        # (priority, job id, job); worker stop sentinels jump the line with priority 0.
+        self._queue = asyncio.PriorityQueue()
+        self._workers = set()
+        self._retiring = 0
+        self._next_id = 1
+        self._save_lock = asyncio.Lock()
+
+    async def start(self):
+        stored = await self.config.download_jobs()
+        for job_id, data in sorted(stored.items(), key=lambda item: int(item[0])):
+            job = DownloadJob.from_dict(int(job_id), data)
+            self.jobs[job.id] = job
+            self._next_id = max(self._next_id, job.id + 1)
+            if not job.active:
+                continue
+            self._by_url[job.video_url] = job
+            if job.remote_id is not None and self.poller is not None:
+                # The API kept downloading while we were away; just pick the tracking back up.
+                self.poller.track(job.id, job.remote_id)
+            else:
+                # Whatever was running when we stopped has to start over.
+                job.status = QUEUED
+                self._enqueue(job)
+        self.set_workers(self.worker_count)
+        if self.poller is not None:
+            self.poller.start()
+
+    async def stop(self):
+        if self.poller is not None:
+            self.poller.stop()
+        for worker in self._workers:
+            worker.cancel()
+        self._workers.clear()
+        await self._save()
+
+    def set_workers(self, count):
+        """
+        Resize the worker pool. Removed workers finish their current job first.
+        """
+        self.worker_count = count
+        live = len(self._workers) - self._retiring
+        for _ in range(count - live):
+            worker = asyncio.create_task(self._worker())
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+        for _ in range(live - count):
+            self._retiring += 1
+            self._queue.put_nowait((0, 0, None))
+
+    def _enqueue(self, job):
+        self._queue.put_nowait((1, job.id, job))
+
+    async def submit(self, video_url, title, requester_id):
+        """
+        Queue a download, or attach to the active job for the same URL.
+
+        Returns `(job, created)`.
+        """
+        job = self._by_url.get(video_url)
+        created = job is None
+        if created:
+            job = DownloadJob(self._next_id, video_url, title)
+            self._next_id += 1
+            self.jobs[job.id] = job
+            self._by_url[video_url] = job
+            self._enqueue(job)
+        if requester_id not in job.requesters:
+            job.requesters.append(requester_id)
+        await self._save()
+        return job, created
+
+    def queue_position(self, job):
+        if job.status != QUEUED:
+            return 0
+        return sum(1 for other in self.jobs.values() if other.status == QUEUED and other.id <= job.id)
+
+    def jobs_for(self, user_id):
+        return [job for job in self.jobs.values() if user_id in job.requesters]
+
+    async def _worker(self):
+        while True:
+            _, _, job = await self._queue.get()
+            if job is None:
+                self._retiring -= 1
+                return
+            if job.status != QUEUED:
+                continue
+            await self._run(job)
+
+    async def _run(self, job):
+        job.status = RUNNING
+        await self._save()
+        await self._report(job)
+        try:
+            answer = await self.download(job.video_url)
+            job.message = answer["message"]
+            if answer.get("job_id") is not None and self.poller is not None:
+                job.remote_id = answer["job_id"]
+                job.progress = 0
+                await self._save()
+                await self._report(job)
+                self.poller.track(job.id, job.remote_id)
+                return
+            job.status = DONE
+        except KaraokeAPIError as e:
+            job.status, job.message = FAILED, f"Error during download: {e}"
+        except asyncio.CancelledError:
+            job.status = QUEUED
+            await self._save()
+            raise
+        except Exception:
+            log.exception("Unexpected error while downloading %s", job.video_url)
+            job.status, job.message = FAILED, "An unexpected error occurred during download."
+        await self._finish(job)
+
+    async def _finish(self, job):
+        self._by_url.pop(job.video_url, None)
+        self._prune()
+        await self._save()
+        try:
+            await self.notify(job)
+        except Exception:
+            log.exception("Failed to notify requesters of download job %s", job.id)
+
+    async def _report(self, job):
+        if self.progress is None:
+            return
+        try:
+            await self.progress(job)
+        except Exception:
+            log.exception("Failed to report progress of download job %s", job.id)
+
+    async def _on_progress(self, job_id, progress, message):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        # Progress alone isn't worth a Config write; it's saved with the next state change.
+        job.progress = progress
+        if message:
+            job.message = message
+        await self._report(job)
+
+    async def _on_remote_finish(self, job_id, ok, message):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        job.status = DONE if ok else FAILED
+        if ok:
+            job.progress = 100
+            job.message = message or "Download finished."
+        else:
+            job.message = f"Error during download: {message or 'Unknown error'}"
+        await self._finish(job)
+
+    def _prune(self):
+        finished = [job for job in self.jobs.values() if not job.active]
+        for job in sorted(finished, key=lambda j: j.id)[: max(0, len(finished) - self.history)]:
+            del self.jobs[job.id]
+
+    async def _save(self):
+        async with self._save_lock:
+            await self.config.download_jobs.set({str(job_id): job.to_dict() for job_id, job in self.jobs.items()})
@@ -1,24 +1,67 @@
 import discord
 import asyncio
-import requests
-from redbot.core import commands
+import logging
+import time
+from redbot.core import Config, commands
 
-API_URL = "https://pak.mulveycreations.com/api"
-API_TOKEN = "jonlivesunderthedesk"
+from .api import KaraokeAPI, KaraokeAPIError
+from .cache import SearchCache
+from .jobs import DownloadQueue
+from .perf import PerfRegistry
+from .picker import ResultPicker
+from .sessions import SessionDispatcher
 
-EMOJI_TO_INDEX = {
-    "1️⃣": 0,
-    "2️⃣": 1,
-    "3️⃣": 2,
-    "4️⃣": 3,
-    "5️⃣": 4
-}
+log = logging.getLogger("red.Karaoke")
 
 class KaraokeDownloader(commands.Cog):
     """Cog to search for karaoke videos interactively via DM."""
 
     def __init__(self, bot):
         self.bot = bot
+        # Latency histograms per command phase and API call; the wiki cog's perfstats shows them.
+        self.perf = PerfRegistry("karaoke")
+        # One pooled HTTP client for all karaoke traffic; opened/closed with the cog.
+        self.api = KaraokeAPI(perf=self.perf)
+        self.config = Config.get_conf(self, identifier=274661292, force_registration=True)
+        self.config.register_global(
+            search_cache_size=256, search_cache_ttl=3600, download_workers=2, download_jobs={},
+            hedge_searches=False
+        )
+        # Repeat searches are served from here instead of the API.
+        self.search_cache = SearchCache()
+        # Deduplicated downloads with bounded concurrency; state survives reloads.
+        # One background poller follows every download the API runs for us.
+        self.downloads = DownloadQueue(
+            self.config, self.api.download, self.notify_download,
+            status=self.api.download_status, progress=self.download_progress
+        )
+        # job id -> {user id: DM message} that gets edited as the download moves along.
+        self.progress_messages = {}
+        # Open result pickers keyed by message ID; picker buttons resolve them.
+        self.sessions = SessionDispatcher()
+
+    async def cog_load(self):
+        self.search_cache.resize(await self.config.search_cache_size())
+        self.search_cache.ttl = await self.config.search_cache_ttl()
+        self.api.hedge = await self.config.hedge_searches()
+        await self.api.start()
+        self.downloads.worker_count = await self.config.download_workers()
+        await self.downloads.start()
+        self.sessions.start()
+
+    async def cog_unload(self):
+        self.sessions.stop()
+        await self.downloads.stop()
+        self.progress_messages.clear()
+        await self.api.close()
+
+    async def cog_before_invoke(self, ctx):
+        ctx.perf_started = time.perf_counter()
+
+    async def cog_after_invoke(self, ctx):
+        started = getattr(ctx, "perf_started", None)
+        if started is not None:
+            self.perf.observe(f"cmd.{ctx.command.qualified_name}", time.perf_counter() - started)
 
     @commands.command()
     async def ksearch(self, ctx, *, song: str):
@@ -28,37 +71,19 @@ class KaraokeDownloader(commands.Cog):
         """
         # Show typing in the channel while processing the search.
         async with ctx.typing():
-            payload = {"song": song}
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {API_TOKEN}"
-            }
             try:
-                response = requests.post(f"{API_URL}/search", json=payload, headers=headers)
-                if response.status_code != 200:
-                    err = response.json().get("error", "Unknown error")
+                try:
+                    results = await self.perf.timed("search", self.search_cache.get(song, self.api.search))
+                except KaraokeAPIError as err:
                     await ctx.send(f"Error during search: {err}")
                     return
 
-                data = response.json()
-                results = data.get("results", [])
                 if not results:
                     await ctx.send("No results found.")
                     return
 
-                # Limit to 5 results.
-                results = results[:5]
-                embed = discord.Embed(
-                    title="Karaoke Search Results",
-                    description="React with the corresponding number to download the video.",
-                    color=discord.Color.blue()
-                )
-                if results[0].get("thumbnail"):
-                    embed.set_thumbnail(url=results[0].get("thumbnail"))
-                for idx, video in enumerate(results, start=1):
-                    title = video.get("title", "Unknown Title")
-                    thumbnail = video.get("thumbnail", "No thumbnail")
-                    embed.add_field(name=f"{idx}. {title}", value=f"[Thumbnail]({thumbnail})", inline=False)
+                # Pages of 5 over the results we already have; no new search per page.
+                picker = ResultPicker(results, ctx.author.id, self.sessions)
             except Exception as e:
                 await ctx.send(f"An exception occurred during search: {e}")
                 return
@@ -66,31 +91,25 @@ class KaraokeDownloader(commands.Cog):
         # Send the results in DM.
         try:
             dm_channel = await ctx.author.create_dm()
-            search_message = await dm_channel.send(embed=embed)
+            # Results and buttons go out in a single message.
+            search_message = await self.perf.timed("send.picker", dm_channel.send(embed=picker.embed(), view=picker))
         except Exception as e:
             await ctx.send("Unable to send DM. Please check your privacy settings.")
             return
 
-        # Add reactions for selection.
-        emojis = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣"]
-        for i in range(len(results)):
-            await search_message.add_reaction(emojis[i])
-
-        def check(reaction, user):
-            return (
-                user == ctx.author and
-                reaction.message.id == search_message.id and
-                str(reaction.emoji) in EMOJI_TO_INDEX
-            )
-
+        selection = self.sessions.open(search_message.id, ctx.author.id, timeout=picker.page_timeout)
         try:
-            reaction, user = await self.bot.wait_for("reaction_add", timeout=60.0, check=check)
+            selected_index = await selection
         except asyncio.TimeoutError:
-            await dm_channel.send("Timed out. Please try the search command again.")
+            picker.stop()
+            try:
+                await search_message.edit(content="Timed out. Please try the search command again.", view=None)
+            except discord.HTTPException:
+                pass
             return
 
-        selected_index = EMOJI_TO_INDEX.get(str(reaction.emoji))
-        if selected_index is None or selected_index >= len(results):
+        results = picker.results
+        if selected_index >= len(results):
             await dm_channel.send("Invalid selection. Please try again.")
             return
 
@@ -100,23 +119,193 @@ class KaraokeDownloader(commands.Cog):
             await dm_channel.send("Selected video has no URL. Please try another.")
             return
 
-        # Indicate that the download process is starting.
-        async with dm_channel.typing():
-            await dm_channel.send("Downloading... Please wait.")
+        # Hand the download to the job queue; this one DM is then edited in place until it finishes.
+        job, created = await self.perf.timed(
+            "queue.submit", self.downloads.submit(video_url, selected_video.get("title"), ctx.author.id)
+        )
+        if created:
+            intro = f"Queued download #{job.id}. Check on it any time with `{ctx.clean_prefix}kstatus {job.id}`."
+        else:
+            intro = f"That song is already being downloaded (job #{job.id}), you're on the list too."
+        message = await self.perf.timed("send.progress", dm_channel.send(f"{intro}\n{self.progress_line(job)}"))
+        if job.active:
+            self.progress_messages.setdefault(job.id, {})[ctx.author.id] = (intro, message)
 
-        # Trigger the download.
-        try:
-            payload_download = {"video_url": video_url}
-            download_response = requests.post(f"{API_URL}/download", json=payload_download, headers=headers)
-            if download_response.status_code != 200:
-                err = download_response.json().get("error", "Unknown error")
-                await dm_channel.send(f"Error during download: {err}")
-                return
+    def progress_line(self, job):
+        """
+        One line describing where a download job is at.
+        """
+        if job.status == "queued":
+            return f"**Queued** (position {self.downloads.queue_position(job)})"
+        if job.status == "running":
+            if job.progress is None:
+                return "**Starting download...**"
+            filled = int(job.progress) // 10
+            return f"**Downloading** `{'█' * filled}{'░' * (10 - filled)}` {job.progress:.0f}%"
+        return f"**{job.status.capitalize()}**: {job.message}"
 
-            message = download_response.json().get("message", "Download triggered successfully.")
-            await dm_channel.send(message)
-        except Exception as e:
-            await ctx.send(f"An exception occurred during download: {e}")
+    async def download_progress(self, job):
+        """
+        Edit every requester's progress DM for a job that is still going.
+        """
+        line = self.progress_line(job)
+        for intro, message in list(self.progress_messages.get(job.id, {}).values()):
+            try:
+                await self.perf.timed("edit.progress", message.edit(content=f"{intro}\n{line}"))
+            except discord.HTTPException:
+                pass
+
+    async def notify_download(self, job):
+        """
+        Tell every requester of a finished download job, in their progress DM where we still have it.
+        """
+        messages = self.progress_messages.pop(job.id, {})
+        for user_id in job.requesters:
+            if user_id in messages:
+                intro, message = messages[user_id]
+                try:
+                    await message.edit(content=f"{intro}\n{self.progress_line(job)}")
+                    continue
+                except discord.HTTPException:
+                    pass
+            user = self.bot.get_user(user_id)
+            if user is None:
+                continue
+            try:
+                await user.send(f"Download #{job.id} ({job.title}): {job.message}")
+            except discord.HTTPException:
+                log.warning("Could not DM user %s about download job %s", user_id, job.id)
+
+    @commands.command()
+    async def kstatus(self, ctx, job_id: int = None):
+        """
+        Show the status of your karaoke downloads, or of one job.
+        Usage: [p]kstatus [job id]
+        """
+        if job_id is not None:
+            job = self.downloads.jobs.get(job_id)
+            jobs = [job] if job else []
+        else:
+            jobs = self.downloads.jobs_for(ctx.author.id)[-5:]
+        if not jobs:
+            await ctx.send("No matching download jobs.")
+            return
+        lines = []
+        for job in jobs:
+            lines.append(f"#{job.id} {job.title}: {self.progress_line(job)}")
+        await ctx.send("\n".join(lines))
+
+    @commands.group()
+    @commands.is_owner()
+    async def kqueue(self, ctx):
+        """
+        Inspect or tune the karaoke download queue.
+        """
+        if ctx.invoked_subcommand is None:
+            await ctx.send_help()
+
+    @kqueue.command(name="workers")
+    async def kqueue_workers(self, ctx, count: int):
+        """
+        Set how many downloads may run against the API at once.
+        """
+        if not 1 <= count <= 10:
+            await ctx.send("Pick between 1 and 10 workers.")
+            return
+        await self.config.download_workers.set(count)
+        self.downloads.set_workers(count)
+        await ctx.send(f"Download queue now runs {count} job(s) at a time.")
+
+    @commands.group(invoke_without_command=True)
+    @commands.is_owner()
+    async def kapi(self, ctx):
+        """
+        Show the karaoke API circuit breaker, retry/hedge counters and latency percentiles.
+        """
+        info = self.api.describe()
+        stats = info["stats"]
+        lines = [f"Circuit breaker: **{info['breaker']}** ({info['consecutive_failures']} consecutive failures)"]
+        if info["retry_in"]:
+            lines.append(f"Next trial request in {info['retry_in']:.0f}s")
+        lines.append(
+            f"Requests: {stats.get('requests', 0)}, failures: {stats.get('failures', 0)}, "
+            f"retries: {stats.get('retries', 0)}, short-circuited: {stats.get('short_circuited', 0)}"
+        )
+        lines.append(
+            f"Hedged searches: {'on' if info['hedge'] else 'off'} "
+            f"({stats.get('hedges', 0)} sent, {stats.get('hedge_wins', 0)} won)"
+        )
+        for path, pct in info["latency"].items():
+            if not pct["samples"]:
+                lines.append(f"`{path}`: no samples yet")
+                continue
+            lines.append(
+                f"`{path}`: p50 {pct['p50'] * 1000:.0f}ms, p95 {pct['p95'] * 1000:.0f}ms, "
+                f"p99 {pct['p99'] * 1000:.0f}ms ({pct['samples']} samples)"
+            )
+        await ctx.send("\n".join(lines))
+
+    @kapi.command(name="hedge")
+    async def kapi_hedge(self, ctx, enabled: bool):
+        """
+        Turn hedged search requests on or off.
+        """
+        await self.config.hedge_searches.set(enabled)
+        self.api.hedge = enabled
+        await ctx.send(f"Hedged searches are now {'on' if enabled else 'off'}.")
+
+    @commands.group()
+    @commands.is_owner()
+    async def kcache(self, ctx):
+        """
+        Inspect or tune the karaoke search cache.
+        """
+        if ctx.invoked_subcommand is None:
+            await ctx.send_help()
+
+    @kcache.command(name="stats")
+    async def kcache_stats(self, ctx):
+        """
+        Show cache size and hit/miss counters.
+        """
+        stats = self.search_cache.stats()
+        await ctx.send(
+            f"Entries: {stats['entries']}/{stats['max_entries']} (TTL {stats['ttl']}s)\n"
+            f"Hits: {stats['hits']}, misses: {stats['misses']}, coalesced: {stats['coalesced']} "
+            f"({stats['hit_rate']:.0%} served without a new API call)"
+        )
+
+    @kcache.command(name="size")
+    async def kcache_size(self, ctx, max_entries: int):
+        """
+        Set how many searches the cache keeps.
+        """
+        if max_entries < 1:
+            await ctx.send("The cache needs room for at least one search.")
+            return
+        await self.config.search_cache_size.set(max_entries)
+        self.search_cache.resize(max_entries)
+        await ctx.send(f"Search cache now keeps up to {max_entries} searches.")
+
+    @kcache.command(name="ttl")
+    async def kcache_ttl(self, ctx, seconds: int):
+        """
+        Set how long search results stay cached, in seconds.
+        """
+        if seconds < 1:
+            await ctx.send("TTL must be at least one second.")
+            return
+        await self.config.search_cache_ttl.set(seconds)
+        self.search_cache.ttl = seconds
+        await ctx.send(f"Search results are now cached for {seconds} seconds.")
+
+    @kcache.command(name="clear")
+    async def kcache_clear(self, ctx):
+        """
+        Drop every cached search.
+        """
+        self.search_cache.clear()
+        await ctx.send("Search cache cleared.")
 
 async def setup(bot):
     await bot.add_cog(KaraokeDownloader(bot))
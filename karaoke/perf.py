@@ -0,0 +1,119 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Same histograms as wiki/perf.py; the karaoke cog is installed on its own, so it keeps a copy.
+# The wiki cog's perfstats command picks this registry up through `cog.perf`.
+
+# Bucket upper bounds in seconds: 50µs to ~60s, each 1.5x the last.
+BUCKETS = tuple(5e-5 * 1.5 ** i for i in range(36))
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram; memory doesn't grow with the sample count.
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        # One slot per bucket plus an overflow slot.
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, pct):
+        """
+        Estimate the `pct` percentile by interpolating inside its bucket.
+        """
+        if not self.count:
+            return None
+        rank = self.count * pct / 100
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                low = BUCKETS[i - 1] if i else 0.0
+                high = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(self.max, low + (high - low) * (rank - seen) / n)
+            seen += n
+        return self.max
+
+
+class PerfRegistry:
+    """
+    Named latency histograms for one cog.
+
+    Time a block with `with perf.timer("lfg.detect"):` or an awaitable with
+    `await perf.timed("send.reply", channel.send(...))`. `snapshot()` feeds
+    the perfstats command and `prometheus()` the text-format dump.
+    """
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.histograms = {}
+
+    def observe(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    async def timed(self, name, awaitable):
+        with self.timer(name):
+            return await awaitable
+
+    def reset(self):
+        self.histograms.clear()
+
+    def snapshot(self):
+        """
+        Return `{name: {"count", "mean", "p50", "p95", "p99", "max"}}`, times in seconds.
+        """
+        return {
+            name: {
+                "count": h.count,
+                "mean": h.total / h.count,
+                "p50": h.percentile(50),
+                "p95": h.percentile(95),
+                "p99": h.percentile(99),
+                "max": h.max,
+            }
+            for name, h in sorted(self.histograms.items())
+            if h.count
+        }
+
+    def prometheus(self):
+        """
+        Return the histograms in Prometheus text exposition format.
+        """
+        metric = f"red_{self.namespace}_duration_seconds"
+        lines = [
+            f"# HELP {metric} Time spent in {self.namespace} command phases.",
+            f"# TYPE {metric} histogram",
+        ]
+        for name, h in sorted(self.histograms.items()):
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for bound, n in zip(BUCKETS, h.counts):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{phase="{label}",le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{phase="{label}",le="+Inf"}} {h.count}')
+            lines.append(f'{metric}_sum{{phase="{label}"}} {h.total:.9g}')
+            lines.append(f'{metric}_count{{phase="{label}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
@@ -0,0 +1,88 @@
+import discord
+
+PAGE_SIZE = 5
+MAX_RESULTS = 25
+
+
+class ResultPicker(discord.ui.View):
+    """
+    Buttons for picking a search result, sent together with the results embed.
+
+    Number buttons hand the picked result's index to the session dispatcher;
+    Prev/Next page through the results already fetched, so browsing never
+    triggers another search. The dispatcher owns the timeout, so the view
+    itself never expires.
+    """
+
+    def __init__(self, results, user_id, sessions, page_timeout: float = 60.0):
+        super().__init__(timeout=None)
+        self.results = results[:MAX_RESULTS]
+        self.user_id = user_id
+        self.sessions = sessions
+        self.page_timeout = page_timeout
+        self.page = 0
+        self._render()
+
+    @property
+    def pages(self):
+        return max(1, -(-len(self.results) // PAGE_SIZE))
+
+    def embed(self):
+        start = self.page * PAGE_SIZE
+        shown = self.results[start:start + PAGE_SIZE]
+        embed = discord.Embed(
+            title="Karaoke Search Results",
+            description="Press the matching number to download the video.",
+            color=discord.Color.blue()
+        )
+        if shown and shown[0].get("thumbnail"):
+            embed.set_thumbnail(url=shown[0].get("thumbnail"))
+        for idx, video in enumerate(shown, start=1):
+            title = video.get("title", "Unknown Title")
+            thumbnail = video.get("thumbnail", "No thumbnail")
+            embed.add_field(name=f"{idx}. {title}", value=f"[Thumbnail]({thumbnail})", inline=False)
+        if self.pages > 1:
+            embed.set_footer(text=f"Page {self.page + 1}/{self.pages}")
+        return embed
+
+    def _render(self):
+        self.clear_items()
+        start = self.page * PAGE_SIZE
+        for offset in range(min(PAGE_SIZE, len(self.results) - start)):
+            button = discord.ui.Button(label=str(offset + 1), style=discord.ButtonStyle.primary, row=0)
+            button.callback = self._make_pick(start + offset)
+            self.add_item(button)
+        if self.pages > 1:
+            prev_button = discord.ui.Button(label="◀ Prev", style=discord.ButtonStyle.secondary, row=1,
+                                            disabled=self.page == 0)
+            prev_button.callback = self._make_turn(-1)
+            self.add_item(prev_button)
+            next_button = discord.ui.Button(label="Next ▶", style=discord.ButtonStyle.secondary, row=1,
+                                            disabled=self.page >= self.pages - 1)
+            next_button.callback = self._make_turn(1)
+            self.add_item(next_button)
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("This isn't your search.", ephemeral=True)
+            return False
+        return True
+
+    def _make_pick(self, index):
+        async def pick(interaction: discord.Interaction):
+            if not self.sessions.dispatch(interaction.message.id, interaction.user.id, index):
+                await interaction.response.edit_message(content="This search has expired.", view=None)
+                self.stop()
+                return
+            # Acknowledge and drop the buttons in the same request.
+            await interaction.response.edit_message(view=None)
+            self.stop()
+        return pick
+
+    def _make_turn(self, step):
+        async def turn(interaction: discord.Interaction):
+            self.page = min(max(self.page + step, 0), self.pages - 1)
+            self._render()
+            self.sessions.extend(interaction.message.id, self.page_timeout)
+            await interaction.response.edit_message(embed=self.embed(), view=self)
+        return turn
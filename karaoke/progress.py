@@ -0,0 +1,183 @@
+import asyncio
+import heapq
+import logging
+import math
+import time
+
+from .api import KaraokeAPIError, KaraokeAPIUnavailable
+
+log = logging.getLogger("red.Karaoke.progress")
+
+# Upstream status words that end a download.
+FINISHED = {"done": True, "completed": True, "finished": True, "failed": False, "error": False}
+
+
+def parse_progress(value):
+    """
+    Return an upstream progress value (45, 45.5, "45", "45%") as a float in 0-100, or None if it isn't one.
+    """
+    if isinstance(value, str):
+        value = value.strip().rstrip("%")
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(value):
+        return None
+    return min(100.0, max(0.0, value))
+
+
+class _Tracked:
+    __slots__ = ("job_id", "remote_id", "interval", "progress", "errors", "started", "due")
+
+    def __init__(self, job_id, remote_id, interval):
+        self.job_id = job_id
+        self.remote_id = remote_id
+        self.interval = interval
+        self.progress = None
+        self.errors = 0
+        self.started = time.monotonic()
+        self.due = 0.0
+
+
+class StatusPoller:
+    """
+    Polls the upstream status of every running download from one task.
+
+    Jobs are kept in a min-heap by next poll time, so the poller sleeps
+    until the earliest one is due and polls everything due in one batch.
+    A job's interval starts at `min_interval` and grows by `factor` up to
+    `max_interval` while nothing changes; any progress snaps it back down.
+
+    `on_update(job_id, progress, message)` is called when progress changes,
+    `on_finish(job_id, ok, message)` once when the job ends.
+    """
+
+    def __init__(
+        self,
+        fetch,
+        on_update,
+        on_finish,
+        min_interval: float = 1.0,
+        max_interval: float = 15.0,
+        factor: float = 1.5,
+        max_errors: int = 5,
+        max_duration: float = 3600.0,
+    ):
+        self.fetch = fetch
+        self.on_update = on_update
+        self.on_finish = on_finish
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self.max_errors = max_errors
+        self.max_duration = max_duration
+        self._tracked = {}
+        self._heap = []
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return len(self._tracked)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def track(self, job_id, remote_id):
+        tracked = _Tracked(job_id, remote_id, self.min_interval)
+        self._tracked[job_id] = tracked
+        self._schedule(tracked)
+        self._wakeup.set()
+
+    def untrack(self, job_id):
+        # Stale heap entries are skipped when they come due.
+        self._tracked.pop(job_id, None)
+
+    async def _run(self):
+        while True:
+            if not self._heap:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            delay = self._heap[0][0] - time.monotonic()
+            if delay > 0:
+                # A newly tracked job may be due sooner than the current head.
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            now = time.monotonic()
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                when, job_id = heapq.heappop(self._heap)
+                tracked = self._tracked.get(job_id)
+                if tracked is not None and tracked.due == when:
+                    due.append(tracked)
+            await asyncio.gather(*(self._poll(tracked) for tracked in due))
+
+    async def _poll(self, tracked):
+        if time.monotonic() - tracked.started > self.max_duration:
+            await self._finish(tracked, False, "The download took too long and was given up on.")
+            return
+        try:
+            status = await self.fetch(tracked.remote_id)
+        except KaraokeAPIUnavailable:
+            # The API is down, not the job; keep backing off until max_duration.
+            self._reschedule(tracked, changed=False)
+            return
+        except KaraokeAPIError as e:
+            tracked.errors += 1
+            if tracked.errors >= self.max_errors:
+                await self._finish(tracked, False, f"Lost track of the download: {e}")
+                return
+            self._reschedule(tracked, changed=False)
+            return
+        except Exception:
+            log.exception("Unexpected error polling download job %s", tracked.job_id)
+            await self._finish(tracked, False, "An unexpected error occurred while checking the download.")
+            return
+
+        tracked.errors = 0
+        state = str(status.get("status", "")).lower()
+        if state in FINISHED:
+            await self._finish(tracked, FINISHED[state], status.get("message") or status.get("error"))
+            return
+        progress = parse_progress(status.get("progress"))
+        changed = progress != tracked.progress
+        if changed:
+            tracked.progress = progress
+            try:
+                await self.on_update(tracked.job_id, progress, status.get("message"))
+            except Exception:
+                log.exception("Failed to report progress of download job %s", tracked.job_id)
+        self._reschedule(tracked, changed)
+
+    def _reschedule(self, tracked, changed):
+        if self._tracked.get(tracked.job_id) is not tracked:
+            return
+        if changed:
+            tracked.interval = self.min_interval
+        else:
+            tracked.interval = min(tracked.interval * self.factor, self.max_interval)
+        self._schedule(tracked)
+
+    def _schedule(self, tracked):
+        tracked.due = time.monotonic() + tracked.interval
+        heapq.heappush(self._heap, (tracked.due, tracked.job_id))
+
+    async def _finish(self, tracked, ok, message):
+        self._tracked.pop(tracked.job_id, None)
+        try:
+            await self.on_finish(tracked.job_id, ok, message)
+        except Exception:
+            log.exception("Failed to finish download job %s", tracked.job_id)
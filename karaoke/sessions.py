@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+
+class _Session:
+    __slots__ = ("user_id", "deadline", "future")
+
+    def __init__(self, user_id, deadline, future):
+        self.user_id = user_id
+        self.deadline = deadline
+        self.future = future
+
+
+class SessionDispatcher:
+    """
+    Routes user input to interactive sessions by message ID.
+
+    Each session waits on a future keyed by the message it is attached to,
+    so handling an incoming event is one dict lookup no matter how many
+    sessions are open. A single sweeper task expires sessions that passed
+    their deadline by failing their future with `asyncio.TimeoutError`.
+    """
+
+    def __init__(self, sweep_interval: float = 1.0):
+        self.sweep_interval = sweep_interval
+        self._sessions = {}
+        self._sweeper = None
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def start(self):
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep())
+
+    def stop(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        for session in self._sessions.values():
+            session.future.cancel()
+        self._sessions.clear()
+
+    def open(self, message_id, user_id, timeout):
+        """
+        Start waiting for `user_id` to answer on `message_id`. Returns the future to await.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._sessions[message_id] = _Session(user_id, time.monotonic() + timeout, future)
+        future.add_done_callback(lambda _: self._discard(message_id, future))
+        return future
+
+    def dispatch(self, message_id, user_id, value):
+        """
+        Deliver `value` to the session on `message_id` if `user_id` owns it.
+
+        Returns True if a session took the value.
+        """
+        session = self._sessions.get(message_id)
+        if session is None or session.user_id != user_id or session.future.done():
+            return False
+        session.future.set_result(value)
+        return True
+
+    def extend(self, message_id, timeout):
+        """
+        Push the session's deadline to `timeout` seconds from now, e.g. after the user paged.
+        """
+        session = self._sessions.get(message_id)
+        if session is not None:
+            session.deadline = time.monotonic() + timeout
+
+    def close(self, message_id):
+        session = self._sessions.pop(message_id, None)
+        if session is not None and not session.future.done():
+            session.future.cancel()
+
+    def _discard(self, message_id, future):
+        session = self._sessions.get(message_id)
+        if session is not None and session.future is future:
+            del self._sessions[message_id]
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            now = time.monotonic()
+            expired = [s for s in self._sessions.values() if s.deadline <= now and not s.future.done()]
+            for session in expired:
+                session.future.set_exception(asyncio.TimeoutError())
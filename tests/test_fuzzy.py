@@ -0,0 +1,71 @@
+import pytest
+
+from wiki.fuzzy import FuzzyIndex
+from wiki.games import GameRegistry
+
+
+@pytest.fixture(scope="module")
+def games():
+    return GameRegistry()
+
+
+@pytest.mark.parametrize("text, role", [
+    ("anyone up for helldiver tonight", "Helldivers 2"),
+    ("tarkv raid?", "Escape from Tarkov"),
+    ("pokémon anyone", "Pokémon"),
+    ("who wants baldurs gate", "Baldur's Gate 3"),
+    ("valo?", "Valorant"),
+])
+def test_typos_resolve(games, text, role):
+    match = games.detect_fuzzy(text)
+    assert match is not None
+    assert match.role == role
+
+
+@pytest.mark.parametrize("text", [
+    "just got back",
+    "need a rest",
+    "the code is broken",
+    "it's cold out",
+    "park it there",
+    "anyone around later?",
+])
+def test_common_words_do_not_match(games, text):
+    assert games.detect_fuzzy(text) is None
+
+
+def test_accents_are_an_exact_match(games):
+    assert games.detect_fuzzy("pokémon").confidence == 1.0
+
+
+def test_typos_are_not_full_confidence(games):
+    for text in ("helldiver", "tarkv", "baldurs gate", "valo"):
+        assert games.detect_fuzzy(text).confidence < 1.0
+
+
+def test_short_keys_get_no_edits():
+    index = FuzzyIndex({"rust": "Rust", "halo": "Halo"}, stopwords=frozenset())
+    assert index.lookup("rest") is None
+    assert index.lookup("hale") is None
+    assert index.lookup("rusts").role == "Rust"
+
+
+def test_prefix_needs_enough_of_the_key():
+    index = FuzzyIndex({"valorant": "Valorant", "callofduty": "Call of Duty"}, stopwords=frozenset())
+    assert index.lookup("valo").role == "Valorant"
+    assert index.lookup("call") is None
+
+
+def test_ties_prefer_prefix_then_shorter_key():
+    # Both at 0.75: two edits from an 8-letter key, or the first half of a 16-letter one.
+    index = FuzzyIndex({"abcdefxy": "Typo", "abcdefghijklmnop": "Prefix"}, stopwords=frozenset())
+    assert index.lookup("abcdefgh").role == "Prefix"
+    # "valor" starts both keys equally well.
+    index = FuzzyIndex({"valorous9": "Longer", "valorant": "Valorant"}, stopwords=frozenset())
+    assert index.lookup("valor").role == "Valorant"
+
+
+def test_stopwords_are_skipped_in_pairs():
+    index = FuzzyIndex({"seaofthieves": "Sea of Thieves", "forza": "Forza"})
+    assert index.search("for a bit") is None
+    assert index.search("just got back") is None
@@ -0,0 +1,74 @@
+import re
+
+import pytest
+
+from benchmarks.corpus import build_corpus
+from wiki.games import GameRegistry
+from wiki.matcher import AliasMatcher
+
+# How each cog prepares a message before detection.
+NORMALIZERS = {
+    "wiki": lambda text: text.lower().replace(" ", ""),
+    "wikibeta": lambda text: text.lower(),
+}
+
+
+@pytest.fixture(scope="module")
+def games():
+    return GameRegistry()
+
+
+def regex_occurrences(aliases, text):
+    """
+    Every match of the old `\\b<alias>\\b` loop, as `(start, end, role)`.
+    """
+    return {
+        (m.start(), m.end(), role)
+        for alias, role in aliases.items()
+        for m in re.finditer(r"\b" + re.escape(alias) + r"\b", text)
+    }
+
+
+@pytest.mark.parametrize("cog", sorted(NORMALIZERS))
+def test_same_occurrences_as_regex_loop(games, cog):
+    normalize = NORMALIZERS[cog]
+    for kind, message in build_corpus():
+        text = normalize(message)
+        assert set(games.matcher.find_all(text)) == regex_occurrences(games.aliases, text), (kind, text)
+
+
+@pytest.mark.parametrize("text, role", [
+    # Longest alias wins...
+    ("bf and cod", "Call of Duty"),
+    ("cod and bf", "Call of Duty"),
+    # ...then the earliest one.
+    ("eft and cod", "Escape from Tarkov"),
+    ("cod and eft", "Call of Duty"),
+    ("lostark", "Lost Ark"),
+    ("ow2 tonight", "Overwatch"),
+])
+def test_tie_breaks(games, text, role):
+    assert games.detect(text) == role
+
+
+@pytest.mark.parametrize("text, found", [
+    ("cod4", False),
+    ("cod_", False),
+    ("#cod!", True),
+    ("bfandcod", False),
+    ("d&d tonight", True),
+    ("dd&d", False),
+])
+def test_word_boundaries(games, text, found):
+    assert (games.detect(text) is not None) == found
+
+
+def test_non_word_edges_follow_regex():
+    matcher = AliasMatcher({"c++": "C++", "-x": "X"})
+    for text in ("c++ anyone", "c++x", "ac++", "a-x", " -x", "-xy"):
+        expected = {
+            (m.start(), m.end(), value)
+            for alias, value in (("c++", "C++"), ("-x", "X"))
+            for m in re.finditer(r"\b" + re.escape(alias) + r"\b", text)
+        }
+        assert set(matcher.find_all(text)) == expected, text
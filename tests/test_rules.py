@@ -0,0 +1,24 @@
+import pytest
+
+from wiki.rules import RuleBook
+
+
+@pytest.fixture(scope="module")
+def rules():
+    return RuleBook()
+
+
+def test_number_lookup(rules):
+    embed, candidates = rules.lookup("3")
+    assert embed is rules.embed(3)
+    assert candidates == []
+
+
+@pytest.mark.parametrize("query", ["²", "¹⁰", "99", "0"])
+def test_odd_numbers_find_nothing(rules, query):
+    assert rules.lookup(query) == (None, [])
+
+
+def test_keyword_lookup(rules):
+    embed, _ = rules.lookup("invites")
+    assert embed is rules.embed(9)
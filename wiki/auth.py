@@ -0,0 +1,85 @@
+from .games import normalize
+
+
+class RoleAuthorizer:
+    """
+    Role-ID based command authorization with a per-member verdict cache.
+
+    The allowlist lives in the cog's guild Config as `allowed_role_ids`.
+    While it is unset, the default role names are resolved against the
+    guild and the resulting IDs are saved once any exist, so renaming a
+    role later does not lock staff out. Verdicts are cached per member and dropped
+    by the cog's member and role listeners.
+    """
+
+    def __init__(self, config, default_role_names):
+        self.config = config
+        self.default_role_names = tuple(default_role_names)
+        # guild_id -> frozenset of allowed role ids
+        self._allowed = {}
+        # guild_id -> {member_id: bool}
+        self._verdicts = {}
+
+    async def allowed_ids(self, guild):
+        """
+        Return the frozenset of role IDs allowed in `guild`.
+        """
+        allowed = self._allowed.get(guild.id)
+        if allowed is not None:
+            return allowed
+        role_ids = await self.config.guild(guild).allowed_role_ids()
+        if role_ids is None:
+            wanted = {normalize(name) for name in self.default_role_names}
+            role_ids = [role.id for role in guild.roles if normalize(role.name) in wanted]
+            if not role_ids:
+                # Not cached: a default role created or renamed later must still be picked up.
+                return frozenset()
+            await self.config.guild(guild).allowed_role_ids.set(role_ids)
+        allowed = frozenset(role_ids)
+        self._allowed[guild.id] = allowed
+        return allowed
+
+    async def is_authorized(self, member):
+        """
+        Return True if `member` holds any allowed role.
+        """
+        verdicts = self._verdicts.setdefault(member.guild.id, {})
+        verdict = verdicts.get(member.id)
+        if verdict is None:
+            allowed = await self.allowed_ids(member.guild)
+            verdict = any(role.id in allowed for role in member.roles)
+            verdicts[member.id] = verdict
+        return verdict
+
+    async def set_allowed(self, guild, role_ids):
+        """
+        Replace the allowlist for `guild` and drop cached verdicts.
+        """
+        role_ids = sorted(set(role_ids))
+        await self.config.guild(guild).allowed_role_ids.set(role_ids)
+        self._allowed[guild.id] = frozenset(role_ids)
+        self._verdicts.pop(guild.id, None)
+
+    async def reset(self, guild):
+        """
+        Go back to resolving the default role names on next use.
+        """
+        await self.config.guild(guild).allowed_role_ids.clear()
+        self.invalidate_guild(guild.id)
+
+    def invalidate_member(self, guild_id, member_id):
+        verdicts = self._verdicts.get(guild_id)
+        if verdicts:
+            verdicts.pop(member_id, None)
+
+    def roles_changed(self, guild_id):
+        """
+        Called when a role is created or edited. Only matters while the guild
+        has no saved allowlist, since a default role may have just appeared.
+        """
+        if guild_id not in self._allowed:
+            self._verdicts.pop(guild_id, None)
+
+    def invalidate_guild(self, guild_id):
+        self._allowed.pop(guild_id, None)
+        self._verdicts.pop(guild_id, None)
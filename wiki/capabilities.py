@@ -0,0 +1,103 @@
+from collections import Counter, OrderedDict
+
+
+class GuildCapabilities:
+    """
+    What the bot itself may do in one guild, read from the guild cache.
+
+    Answers "can I give this role?" and "can I time this member out?"
+    locally, with the same rules Discord applies, so requests that would
+    only come back as Forbidden are never sent. If the bot's own member
+    isn't cached yet, every check passes and the API gets the final say.
+    """
+
+    def __init__(self, guild):
+        self.guild_id = guild.id
+        self.owner_id = guild.owner_id
+        me = guild.me
+        self.known = me is not None
+        if not self.known:
+            self.manage_roles = self.moderate_members = True
+            self.top_position = None
+            self.top_role_name = None
+            return
+        perms = me.guild_permissions
+        self.manage_roles = perms.manage_roles or perms.administrator
+        self.moderate_members = perms.moderate_members or perms.administrator
+        self.top_position = me.top_role.position
+        self.top_role_name = me.top_role.name
+
+    def can_assign(self, role):
+        """
+        Return `(ok, reason)` for adding `role` to someone.
+        """
+        if not self.known:
+            return True, None
+        if not self.manage_roles:
+            return False, "I'm missing the Manage Roles permission"
+        if role.managed:
+            return False, f"**{role.name}** is managed by an integration"
+        if role.position >= self.top_position:
+            return False, f"**{role.name}** is not below my top role **{self.top_role_name}**"
+        return True, None
+
+    def can_timeout(self, member):
+        """
+        Return `(ok, reason)` for timing `member` out.
+        """
+        if not self.known:
+            return True, None
+        if not self.moderate_members:
+            return False, "I'm missing the Moderate Members permission"
+        if member.id == self.owner_id:
+            return False, "the server owner can't be timed out"
+        if member.guild_permissions.administrator:
+            return False, "administrators can't be timed out"
+        if member.top_role.position >= self.top_position:
+            return False, f"your top role is not below my top role **{self.top_role_name}**"
+        return True, None
+
+
+class CapabilityCache:
+    """
+    Lazily built GuildCapabilities per guild, bounded with LRU eviction.
+
+    Cogs call `invalidate` from their role, guild and bot-member listeners.
+    `denied` counts requests skipped because a check failed, per kind.
+    """
+
+    def __init__(self, max_guilds=64):
+        self.max_guilds = max_guilds
+        self._caps = OrderedDict()
+        self.denied = Counter()
+
+    def get(self, guild):
+        caps = self._caps.get(guild.id)
+        if caps is None:
+            caps = GuildCapabilities(guild)
+            # Don't keep a guess around; try again once the bot's member is cached.
+            if caps.known:
+                self._caps[guild.id] = caps
+                while len(self._caps) > self.max_guilds:
+                    self._caps.popitem(last=False)
+        else:
+            self._caps.move_to_end(guild.id)
+        return caps
+
+    def can_assign(self, guild, role):
+        ok, reason = self.get(guild).can_assign(role)
+        if not ok:
+            self.denied["add role"] += 1
+        return ok, reason
+
+    def can_timeout(self, member):
+        ok, reason = self.get(member.guild).can_timeout(member)
+        if not ok:
+            self.denied["timeout"] += 1
+        return ok, reason
+
+    def invalidate(self, guild_id):
+        self._caps.pop(guild_id, None)
+
+    def clear(self):
+        self._caps.clear()
@@ -0,0 +1,265 @@
+import asyncio
+import heapq
+import logging
+import time
+from collections import Counter
+from datetime import timedelta
+
+import discord
+from discord.utils import utcnow
+
+log = logging.getLogger("red.Wiki.fafo")
+
+# How long a FAFO warning stays up, and how long a click times the clicker out.
+WARNING_LIFETIME = 180
+TIMEOUT_DURATION = timedelta(minutes=5)
+
+
+class TokenBucket:
+    """
+    Allows `burst` calls at once, refilling at `rate` calls per second.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        # The lock makes waiters queue up in order instead of all waking at once.
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class FafoBatcher:
+    """
+    Collects FAFO clicks per guild and times people out in paced batches.
+
+    The first click in a guild opens a `window`-second debounce window;
+    everything clicked in it is handled together. Repeat clickers are
+    answered right away without another timeout, members who are already
+    timed out are skipped, and the timeout calls themselves go through a
+    per-guild token bucket so a click storm doesn't run into Discord's
+    rate limit and hold up moderation commands behind it. With a
+    `CapabilityCache`, members the bot can't time out are told so without
+    a request being made.
+    """
+
+    def __init__(self, window: float = 1.0, rate: float = 2.0, burst: int = 5, capabilities=None):
+        self.window = window
+        self.capabilities = capabilities
+        self.rate = rate
+        self.burst = burst
+        self.stats = Counter()
+        # guild id -> {member id: interaction} waiting for the next batch
+        self._pending = {}
+        # guild id -> member ids in the batch being processed
+        self._running = {}
+        self._tasks = {}
+        self._buckets = {}
+
+    async def submit(self, interaction: discord.Interaction):
+        guild_id = interaction.guild.id
+        user_id = interaction.user.id
+        self.stats["clicks"] += 1
+        pending = self._pending.setdefault(guild_id, {})
+        if user_id in pending or user_id in self._running.get(guild_id, ()):
+            self.stats["deduped"] += 1
+            await interaction.followup.send("You're already on the list. Patience.", ephemeral=True)
+            return
+        pending[user_id] = interaction
+        if guild_id not in self._tasks:
+            self._tasks[guild_id] = asyncio.create_task(self._flush(interaction.guild))
+
+    def cancel_all(self):
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._tasks.clear()
+        self._pending.clear()
+        self._running.clear()
+
+    async def _flush(self, guild):
+        bucket = self._buckets.get(guild.id)
+        if bucket is None:
+            bucket = self._buckets[guild.id] = TokenBucket(self.rate, self.burst)
+        try:
+            while self._pending.get(guild.id):
+                await asyncio.sleep(self.window)
+                batch = self._pending.pop(guild.id, {})
+                self._running[guild.id] = set(batch)
+                self.stats["batches"] += 1
+                await asyncio.gather(*(self._apply(guild, interaction, bucket) for interaction in batch.values()))
+                self._running.pop(guild.id, None)
+        finally:
+            # No await between the last pending check and here, so no click can slip in unflushed.
+            self._tasks.pop(guild.id, None)
+            self._running.pop(guild.id, None)
+            if not self._pending.get(guild.id):
+                self._pending.pop(guild.id, None)
+
+    async def _apply(self, guild, interaction, bucket):
+        try:
+            member = guild.get_member(interaction.user.id)
+
+            if member is None:
+                await interaction.followup.send("Member not found.", ephemeral=True)
+                return
+
+            if member.timed_out_until is not None and member.timed_out_until > utcnow():
+                self.stats["already_timed_out"] += 1
+                await interaction.followup.send("You're already timed out.", ephemeral=True)
+                return
+
+            if self.capabilities is not None:
+                ok, reason = self.capabilities.can_timeout(member)
+                if not ok:
+                    await interaction.followup.send(f"I can't time you out: {reason}.", ephemeral=True)
+                    return
+
+            await bucket.acquire()
+            await member.timeout(utcnow() + TIMEOUT_DURATION, reason="FAFO button clicked.")
+            self.stats["timeouts"] += 1
+            await interaction.followup.send("You have been timed out for 5 minutes.", ephemeral=True)
+
+        except discord.Forbidden:
+            await interaction.followup.send(
+                "I don't have permission to timeout you. Please check my role position and permissions.",
+                ephemeral=True
+            )
+        except discord.HTTPException as http_err:
+            log.exception("HTTP error during FAFO timeout.")
+            await interaction.followup.send(f"An error occurred: {http_err}", ephemeral=True)
+        except Exception:
+            log.exception("Unexpected error occurred in FAFO button.")
+            await interaction.followup.send("An unexpected error occurred while processing FAFO.", ephemeral=True)
+
+
+class FafoButton(discord.ui.DynamicItem[discord.ui.Button], template=r"wiki:fafo"):
+    """
+    The FAFO button, routed by its custom_id instead of by message.
+
+    Once the class is registered with `bot.add_dynamic_items`, discord.py
+    answers a click on any message carrying the template's custom_id by
+    building a fresh button from this class, so nothing is stored per sent
+    warning and clicks on warnings from before a restart or reload reach
+    whatever cog is loaded now. Clicks are handed to the `fafo_batcher` of
+    the cog named `cog_name`. Another cog gets its own button by
+    subclassing with its own template and `cog_name`.
+    """
+
+    cog_name = "Wiki"
+
+    def __init__(self):
+        super().__init__(
+            discord.ui.Button(label="FAFO", style=discord.ButtonStyle.danger, custom_id=self.template.pattern)
+        )
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls()
+
+    @classmethod
+    def view(cls):
+        """
+        Return a view holding just this button, to send with a warning.
+        """
+        view = discord.ui.View(timeout=None)
+        view.add_item(cls())
+        return view
+
+    async def callback(self, interaction: discord.Interaction):
+        # Acknowledge within Discord's 3 seconds; the batch answers through followups.
+        await interaction.response.defer(ephemeral=True)
+        cog = interaction.client.get_cog(self.cog_name)
+        if cog is None:
+            await interaction.followup.send("FAFO isn't available right now.", ephemeral=True)
+            return
+        await cog.fafo_batcher.submit(interaction)
+
+
+class ExpiryScheduler:
+    """
+    Deletes messages once they expire, from a single task.
+
+    Pending deletions live in a min-heap of `(expires_at, channel_id, message_id)`
+    that is mirrored to a Config value, so warnings posted before a restart
+    are still cleaned up after it. Expiry times are wall-clock timestamps
+    for the same reason.
+    """
+
+    def __init__(self, bot, value):
+        self.bot = bot
+        # A Config value holding the heap as a list of [expires_at, channel_id, message_id].
+        self.value = value
+        self._heap = []
+        self._wakeup = asyncio.Event()
+        self._save_lock = asyncio.Lock()
+        self._task = None
+
+    def __len__(self):
+        return len(self._heap)
+
+    async def start(self):
+        self._heap = [tuple(entry) for entry in await self.value()]
+        heapq.heapify(self._heap)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def schedule(self, channel_id, message_id, delay):
+        heapq.heappush(self._heap, (time.time() + delay, channel_id, message_id))
+        self._wakeup.set()
+        await self._save()
+
+    async def _run(self):
+        # Channels aren't cached until the bot is ready.
+        await self.bot.wait_until_red_ready()
+        while True:
+            if not self._heap:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            now = time.time()
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap))
+            await asyncio.gather(*(self._delete(channel_id, message_id) for _, channel_id, message_id in due))
+            await self._save()
+
+    async def _delete(self, channel_id, message_id):
+        channel = self.bot.get_channel(channel_id)
+        if channel is None or not hasattr(channel, "get_partial_message"):
+            return
+        try:
+            await channel.get_partial_message(message_id).delete()
+        except discord.NotFound:
+            pass
+        except discord.HTTPException as e:
+            log.warning(f"Failed to delete expired FAFO message {message_id}: {e}")
+
+    async def _save(self):
+        async with self._save_lock:
+            await self.value.set([list(entry) for entry in self._heap])
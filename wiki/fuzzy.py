@@ -0,0 +1,207 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, namedtuple
+
+FuzzyMatch = namedtuple("FuzzyMatch", "role alias query confidence")
+
+_WORD = re.compile(r"[^\W_]+")
+
+# Everyday chat words that sit one typo or a short prefix away from some alias
+# ("rest" -> rust, "ghost" -> ghost recon). Never looked up, alone or in a pair.
+STOPWORDS = frozenset({
+    "about", "after", "again", "also", "among", "anybody", "anyone", "back", "been", "call", "code", "cold",
+    "come", "content", "dead", "demon", "descend", "destined", "dirty", "does", "doing", "done", "down",
+    "dragon", "dying", "elder", "fall", "farming", "five", "fiver", "fort", "from", "game", "games", "ghost",
+    "going", "gonna", "good", "have", "hello", "here", "into", "jack", "just", "later", "like", "lock",
+    "loose", "lost", "make", "monster", "more", "need", "night", "only", "over", "park", "play", "playing",
+    "rain", "ready", "really", "rest", "rocket", "rusty", "some", "star", "that", "them", "then", "there",
+    "they", "this", "tiny", "tonight", "wanna", "want", "what", "when", "where", "wild", "will", "with",
+    "your",
+})
+
+
+def fold(text):
+    """
+    Casefold and strip accents, so "Pokémon" and "pokemon" compare equal.
+    """
+    decomposed = unicodedata.normalize("NFKD", str(text).casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def squash(text):
+    """
+    Fold and drop everything but letters and digits: "Baldur's Gate 3" -> "baldursgate3".
+    """
+    return "".join(_WORD.findall(fold(text)))
+
+
+def trigrams(key):
+    padded = f"$${key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_levenshtein(a, b, limit):
+    """
+    Edit distance between `a` and `b`, or `limit + 1` as soon as it must exceed `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """
+    Typo-tolerant lookup over aliases and role names.
+
+    Keys are squashed (accents, case, spaces and punctuation removed) and
+    put in a trigram inverted index and a sorted list once, at build time.
+    A query is tried as an exact key, as the start of a longer key
+    ("valo" -> valorant, if it covers at least `prefix_ratio` of it) and,
+    from `edit_min_length` characters up, within a few edits of a key. Edit
+    distances are only computed against keys that share enough trigrams
+    with the query, so the cost depends on how many keys look alike, not on
+    how many there are.
+
+    Confidence is 1.0 for an exact key, one minus the edit distance over
+    the longer key for a typo, and the covered share (at least `threshold`)
+    for a prefix; anything below `threshold` is not a match. Ties go to a
+    prefix match, then to the shorter key. Words in `stopwords` are never
+    looked up.
+    """
+
+    def __init__(
+        self,
+        aliases,
+        roles=(),
+        threshold: float = 0.75,
+        min_length: int = 4,
+        edit_min_length: int = 5,
+        max_distance: int = 2,
+        prefix_ratio: float = 0.5,
+        stopwords=STOPWORDS,
+    ):
+        self.threshold = threshold
+        self.min_length = min_length
+        self.edit_min_length = edit_min_length
+        self.max_distance = max_distance
+        self.prefix_ratio = prefix_ratio
+        self.stopwords = stopwords
+        # key id -> (squashed key, alias as shown to users, role name)
+        self._keys = []
+        self._exact = {}
+        self._postings = {}
+        for alias, role in aliases.items():
+            self._add(alias, role)
+        for role in roles:
+            self._add(role, role)
+        self._sorted = sorted(self._exact)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _add(self, shown, role):
+        key = squash(shown)
+        if len(key) < 2 or key in self._exact:
+            return
+        key_id = len(self._keys)
+        self._keys.append((key, shown, role))
+        self._exact[key] = key_id
+        for gram in trigrams(key):
+            self._postings.setdefault(gram, []).append(key_id)
+
+    def _prefixed(self, key):
+        """
+        Yield `(key id, confidence)` for every longer key that starts with `key`.
+        """
+        i = bisect_left(self._sorted, key)
+        while i < len(self._sorted) and self._sorted[i].startswith(key):
+            candidate = self._sorted[i]
+            i += 1
+            covered = len(key) / len(candidate)
+            if covered >= self.prefix_ratio:
+                yield self._exact[candidate], max(self.threshold, covered)
+
+    def _near(self, key):
+        """
+        Yield `(key id, confidence)` for every key within the allowed edits of `key`.
+        """
+        limit = min(self.max_distance, int(len(key) * (1 - self.threshold)))
+        if limit < 1:
+            return
+        grams = trigrams(key)
+        # Each edit breaks at most three trigrams.
+        needed = max(1, len(grams) - 3 * limit)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        for key_id, count in shared.items():
+            if count < needed:
+                continue
+            candidate = self._keys[key_id][0]
+            distance = bounded_levenshtein(key, candidate, limit)
+            if distance > limit:
+                continue
+            confidence = 1 - distance / max(len(key), len(candidate))
+            if confidence >= self.threshold:
+                yield key_id, confidence
+
+    def lookup(self, query):
+        """
+        Return the best FuzzyMatch for one word or phrase, or None.
+        """
+        key = squash(query)
+        if len(key) < self.min_length or key in self.stopwords:
+            return None
+        key_id = self._exact.get(key)
+        if key_id is not None:
+            _, shown, role = self._keys[key_id]
+            return FuzzyMatch(role, shown, query, 1.0)
+
+        # (confidence, is prefix, shorter key, earlier key) - the largest wins.
+        best = None
+        for key_id, confidence in self._prefixed(key):
+            rank = (confidence, True, -len(self._keys[key_id][0]), -key_id)
+            best = rank if best is None or rank > best else best
+        if len(key) >= self.edit_min_length:
+            for key_id, confidence in self._near(key):
+                rank = (confidence, False, -len(self._keys[key_id][0]), -key_id)
+                best = rank if best is None or rank > best else best
+        if best is None:
+            return None
+        _, shown, role = self._keys[-best[3]]
+        return FuzzyMatch(role, shown, query, best[0])
+
+    def search(self, text, max_words: int = 60):
+        """
+        Return the best FuzzyMatch among the words of `text` and pairs of
+        neighbouring words ("baldurs gate"), or None. Of equally good
+        matches the one earliest in `text` wins.
+        """
+        # Queries keep their accents so replies can quote what was typed; lookup folds them.
+        words = _WORD.findall(unicodedata.normalize("NFC", text))[:max_words]
+        # Single letters glue too easily: "for a" is one typo from "forza".
+        usable = [len(word) > 1 and squash(word) not in self.stopwords for word in words]
+        queries = words + [
+            f"{a} {b}" for (a, b), ok_a, ok_b in zip(zip(words, words[1:]), usable, usable[1:]) if ok_a and ok_b
+        ]
+        best = None
+        for query in queries:
+            match = self.lookup(query)
+            if match is not None and (best is None or match.confidence > best.confidence):
+                best = match
+                if match.confidence == 1.0:
+                    break
+        return best
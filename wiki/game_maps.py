@@ -0,0 +1,133 @@
+import asyncio
+from functools import partial
+
+from .games import ALIAS_TO_ROLE, ROLE_NAME_TO_CHANNEL_ID, GameRegistry, normalize
+
+
+class GameMaps:
+    """
+    Per-guild alias and channel tables, stored in Config and served from memory.
+
+    A guild with nothing saved uses the built-in tables. The first edit
+    copies them into the guild's `game_aliases` / `game_channels` and edits
+    the copy. Every edit builds a complete new GameRegistry (matcher, fuzzy
+    index and all) in an executor and then swaps it in with one dict
+    assignment. `get` never awaits, and a command that took a registry at
+    its start keeps using that one snapshot even if an edit lands halfway
+    through.
+    """
+
+    def __init__(self, config, default: GameRegistry):
+        self.config = config
+        self.default = default
+        # guild_id -> GameRegistry, only for guilds with their own tables
+        self._registries = {}
+        self._locks = {}
+
+    def get(self, guild):
+        """
+        Return the registry in effect for `guild`.
+        """
+        if guild is None:
+            return self.default
+        return self._registries.get(guild.id, self.default)
+
+    def customized(self, guild):
+        return guild.id in self._registries
+
+    async def load(self):
+        for guild_id, data in (await self.config.all_guilds()).items():
+            if data.get("game_aliases") is None:
+                continue
+            self._registries[guild_id] = await self._build(data["game_aliases"], data["game_channels"] or {})
+
+    async def tables(self, guild):
+        """
+        Return copies of `(alias -> role name, role name -> channel id)` for `guild`.
+        """
+        group = self.config.guild(guild)
+        aliases = await group.game_aliases()
+        if aliases is None:
+            return dict(ALIAS_TO_ROLE), dict(ROLE_NAME_TO_CHANNEL_ID)
+        return dict(aliases), dict(await group.game_channels() or {})
+
+    async def _build(self, aliases, channels):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(GameRegistry, aliases, channels))
+
+    async def _edit(self, guild, edit):
+        """
+        Apply `edit(aliases, channels)` to the guild's tables, save them and swap in the new registry.
+        Returns whatever `edit` returned.
+        """
+        lock = self._locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            aliases, channels = await self.tables(guild)
+            result = edit(aliases, channels)
+            registry = await self._build(aliases, channels)
+            group = self.config.guild(guild)
+            await group.game_aliases.set(aliases)
+            await group.game_channels.set(channels)
+            self._registries[guild.id] = registry
+        return result
+
+    async def set_alias(self, guild, alias, role_name):
+        """
+        Point `alias` at `role_name`, adding it or replacing what it pointed at before.
+        Returns the previous role name, or None.
+        """
+        def edit(aliases, channels):
+            previous = _pop_normalized(aliases, alias)
+            aliases[" ".join(alias.casefold().split())] = role_name
+            return previous
+
+        return await self._edit(guild, edit)
+
+    async def remove_alias(self, guild, alias):
+        """
+        Drop `alias`. Returns the role name it pointed at, or None if it wasn't there.
+        """
+        if normalize(alias) not in self.get(guild).aliases:
+            return None
+        return await self._edit(guild, lambda aliases, channels: _pop_normalized(aliases, alias))
+
+    async def set_channel(self, guild, role_name, channel_id):
+        """
+        Map `role_name` to `channel_id`. Returns the previous channel id, or None.
+        """
+        def edit(aliases, channels):
+            previous = _pop_normalized(channels, role_name)
+            channels[role_name] = channel_id
+            return previous
+
+        return await self._edit(guild, edit)
+
+    async def remove_channel(self, guild, role_name):
+        """
+        Drop the channel mapped to `role_name`. Returns its id, or None if there wasn't one.
+        """
+        if normalize(role_name) not in self.get(guild).channels:
+            return None
+        return await self._edit(guild, lambda aliases, channels: _pop_normalized(channels, role_name))
+
+    async def reset(self, guild):
+        """
+        Go back to the built-in tables.
+        """
+        lock = self._locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            group = self.config.guild(guild)
+            await group.game_aliases.clear()
+            await group.game_channels.clear()
+            self._registries.pop(guild.id, None)
+
+
+def _pop_normalized(table, key):
+    """
+    Remove every entry whose key normalizes like `key`; return the last value removed, or None.
+    """
+    wanted = normalize(key)
+    previous = None
+    for existing in [k for k in table if normalize(k) == wanted]:
+        previous = table.pop(existing)
+    return previous
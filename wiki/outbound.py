@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+
+import discord
+
+from .fafo import TokenBucket
+
+log = logging.getLogger("red.Wiki.outbound")
+
+
+class _PingBatch:
+    __slots__ = ("role", "body", "members", "due")
+
+    def __init__(self, role, body, due):
+        self.role = role
+        self.body = body
+        self.members = {}
+        self.due = due
+
+    def content(self):
+        mentions = " ".join(member.mention for member in self.members.values())
+        return f"{self.role.mention} {mentions}\n{self.body}"
+
+
+class OutboundScheduler:
+    """
+    Per-channel queue for messages nobody has to wait on.
+
+    `ping` and `send` return at once; one task per channel with queued work
+    drains it in order. Each channel has its own token bucket, sized under
+    Discord's per-channel message limit (5 per 5 seconds), so a burst waits
+    here instead of collecting 429s. Those 429s would stall other requests
+    on the same route, including staff commands.
+
+    A ping for a role is held for `window` seconds. Further pings for the
+    same role in the same channel during that time are merged into it, so
+    the role is mentioned once together with everyone who asked.
+    """
+
+    def __init__(self, window: float = 2.0, rate: float = 1.0, burst: int = 5, perf=None):
+        self.window = window
+        self.rate = rate
+        self.burst = burst
+        self.perf = perf
+        self.stats = Counter()
+        # channel id -> deque of _PingBatch or (content, kwargs)
+        self._queues = {}
+        # channel id -> {role id: _PingBatch not sent yet}
+        self._open = {}
+        self._tasks = {}
+        self._buckets = {}
+
+    def __len__(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+    def ping(self, channel, role, member, body):
+        """
+        Queue `role` and `member` mentions followed by `body`, merged with other pings for `role` in `channel`.
+        """
+        self.stats["pings"] += 1
+        batch = self._open.setdefault(channel.id, {}).get(role.id)
+        if batch is not None:
+            if member.id not in batch.members:
+                self.stats["coalesced"] += 1
+            batch.members[member.id] = member
+            return
+        batch = _PingBatch(role, body, time.monotonic() + self.window)
+        batch.members[member.id] = member
+        self._open[channel.id][role.id] = batch
+        self._push(channel, batch)
+
+    def send(self, channel, content, **kwargs):
+        """
+        Queue a plain message for `channel`.
+        """
+        self._push(channel, (content, kwargs))
+
+    def _push(self, channel, item):
+        self.stats["queued"] += 1
+        self._queues.setdefault(channel.id, deque()).append(item)
+        if channel.id not in self._tasks:
+            self._tasks[channel.id] = asyncio.create_task(self._drain(channel))
+
+    def cancel_all(self):
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._tasks.clear()
+        self._queues.clear()
+        self._open.clear()
+
+    async def _drain(self, channel):
+        bucket = self._buckets.get(channel.id)
+        if bucket is None:
+            bucket = self._buckets[channel.id] = TokenBucket(self.rate, self.burst)
+        queue = self._queues[channel.id]
+        try:
+            while queue:
+                item = queue[0]
+                if isinstance(item, _PingBatch):
+                    delay = item.due - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    # Closed from here on; a new ping for the role starts a new batch.
+                    self._open.get(channel.id, {}).pop(item.role.id, None)
+                    content, kwargs = item.content(), {}
+                else:
+                    content, kwargs = item
+                await bucket.acquire()
+                await self._send(channel, content, kwargs)
+                # Popped only once sent, so len() covers the message in flight too.
+                queue.popleft()
+        finally:
+            # No await between the last queue check and here, so nothing queued is left behind.
+            self._tasks.pop(channel.id, None)
+            if not queue:
+                self._queues.pop(channel.id, None)
+                self._open.pop(channel.id, None)
+
+    async def _send(self, channel, content, kwargs):
+        start = time.perf_counter()
+        try:
+            await channel.send(content, **kwargs)
+            self.stats["sent"] += 1
+        except discord.HTTPException as e:
+            self.stats["failed"] += 1
+            log.warning(f"Failed to send queued message to channel {channel.id}: {e}")
+        except Exception:
+            self.stats["failed"] += 1
+            log.exception(f"Unexpected error sending queued message to channel {channel.id}.")
+        finally:
+            if self.perf is not None:
+                self.perf.observe("send.queued", time.perf_counter() - start)
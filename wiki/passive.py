@@ -0,0 +1,105 @@
+import string
+import time
+from collections import Counter
+
+# Words people use when they're looking for someone to play with.
+INTENT_WORDS = frozenset({
+    "anyone", "anybody", "any1", "who", "whos", "who's", "lfg", "lfm", "squad", "group", "party",
+    "join", "play", "playing", "tonight", "later", "down", "up", "wanna", "want",
+})
+_STRIP = ".,!?;:()[]{}<>\"'*_~`"
+# Bot prefixes are punctuation; commands get answered by the command, not a nudge.
+_COMMAND_START = frozenset(string.punctuation)
+
+
+class PassiveDetector:
+    """
+    Decides whether an ordinary chat message is someone looking for a group.
+
+    Runs on every message in the configured channels, so it rejects as
+    early and as cheaply as it can:
+
+    1. length, a leading prefix character, and per-channel / per-user
+       cooldowns (dict lookups),
+    2. a question mark or an intent word ("anyone", "lfg", "squad", ...),
+    3. at least one token that starts some alias, checked against a set,
+    4. only then the full alias matcher, on at most `max_chars` characters.
+
+    Step 4 is timed. A scan that runs over `budget` seconds pauses the
+    channel for `overrun_pause` seconds, so a pathological channel can't
+    keep costing event-loop time.
+    """
+
+    def __init__(
+        self,
+        min_length: int = 6,
+        max_chars: int = 300,
+        channel_cooldown: float = 120.0,
+        user_cooldown: float = 900.0,
+        budget: float = 0.002,
+        overrun_pause: float = 60.0,
+        max_tracked: int = 5000,
+    ):
+        self.min_length = min_length
+        self.max_chars = max_chars
+        self.channel_cooldown = channel_cooldown
+        self.user_cooldown = user_cooldown
+        self.budget = budget
+        self.overrun_pause = overrun_pause
+        self.max_tracked = max_tracked
+        self.stats = Counter()
+        # id -> monotonic time until which it is quiet
+        self._channel_until = {}
+        self._user_until = {}
+
+    def check(self, games, content, channel_id, user_id):
+        """
+        Return the role name from the `games` registry to nudge `user_id` toward, or None.
+        """
+        self.stats["seen"] += 1
+        if len(content) < self.min_length:
+            self.stats["too_short"] += 1
+            return None
+        if content[0] in _COMMAND_START:
+            self.stats["command"] += 1
+            return None
+        now = time.monotonic()
+        if self._channel_until.get(channel_id, 0) > now or self._user_until.get(user_id, 0) > now:
+            self.stats["cooldown"] += 1
+            return None
+
+        text = content[:self.max_chars].casefold()
+        tokens = [token.strip(_STRIP) for token in text.split()]
+        if "?" not in text and INTENT_WORDS.isdisjoint(tokens):
+            self.stats["no_intent"] += 1
+            return None
+        if games.alias_heads.isdisjoint(tokens):
+            self.stats["no_alias_token"] += 1
+            return None
+
+        start = time.perf_counter()
+        role_name = games.detect(text)
+        if time.perf_counter() - start > self.budget:
+            self.stats["budget_overrun"] += 1
+            self._quiet(self._channel_until, channel_id, now + self.overrun_pause)
+        if role_name is None:
+            self.stats["no_match"] += 1
+            return None
+        self.stats["matched"] += 1
+        return role_name
+
+    def mark(self, channel_id, user_id):
+        """
+        Start the cooldowns after a nudge was sent.
+        """
+        now = time.monotonic()
+        self._quiet(self._channel_until, channel_id, now + self.channel_cooldown)
+        self._quiet(self._user_until, user_id, now + self.user_cooldown)
+        self.stats["nudged"] += 1
+
+    def _quiet(self, table, key, until):
+        table[key] = max(until, table.get(key, 0))
+        if len(table) > self.max_tracked:
+            now = time.monotonic()
+            for stale in [k for k, t in table.items() if t <= now]:
+                del table[stale]
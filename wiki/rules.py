@@ -0,0 +1,143 @@
+import re
+from collections import Counter
+
+import discord
+
+RULES_URL = "https://wiki.parentsthatga.me/rules"
+
+# Rule number -> summary shown in the embed. The first line is the title.
+RULES = {
+    1: "**1️⃣ Be Respectful**\nTreat everyone respectfully. Disrespectful or toxic behavior will result in action.",
+    2: "**2️⃣ 18+ Only**\nPA is for adults only. You must be 18 or older to participate.",
+    3: "**3️⃣ Be Civil & Read the Room**\nAvoid sensitive topics unless everyone is comfortable. No such discussions in text channels.",
+    4: "**4️⃣ NSFW Content Is Not Allowed**\nExplicit, grotesque, or pornographic content will result in a ban.",
+    5: "**5️⃣ Communication - English Preferred**\nPlease speak in English so the whole community can engage.",
+    6: "**6️⃣ Use Channels & Roles Properly**\nUse the correct channels for each topic.\n📌 [Roles How-To](https://wiki.parentsthatga.me/discord/roles)\n📌 [LFG Guide](https://wiki.parentsthatga.me/discord/lfg)",
+    7: "**7️⃣ Promoting Your Own Content**\nPromote in #promote-yourself or #clip-sharing only. Apply in #applications to post on official PA platforms.",
+    8: "**8️⃣ Crowdfunding & Solicitation**\nNo donation or solicitation links allowed. DM spam is not tolerated.",
+    9: "**9️⃣ No Unapproved Invites or Links**\nGame server links require vetting and Discord invites are absolutely not allowed.\n📌 [Host/Advertise](https://wiki.parentsthatga.me/servers/hosting)\n📌 [Apply for Vetting](https://discord.com/channels/629113661113368594/693601096467218523/1349427482637635677)",
+    10: "**🔟 Build-A-VC Channel Names**\nChannel names must be clean and appropriate for Discord Discovery."
+}
+
+# Words staff reach for that the rule text itself doesn't use.
+RULE_KEYWORDS = {
+    1: ("respect", "toxic", "rude", "harass", "harassment", "bully", "insult", "slur"),
+    2: ("adult", "age", "minor", "kid", "underage"),
+    3: ("civil", "politics", "political", "religion", "sensitive", "drama", "topic"),
+    4: ("nsfw", "porn", "explicit", "gore", "lewd", "nude"),
+    5: ("english", "language", "speak"),
+    6: ("channel", "role", "lfg", "offtopic"),
+    7: ("promote", "promotion", "selfpromo", "stream", "twitch", "youtube", "clip"),
+    8: ("donation", "donate", "crowdfunding", "solicit", "patreon", "kickstarter", "dm", "spam"),
+    9: ("invite", "link", "server", "advertise", "advertising", "ad"),
+    10: ("vc", "voice", "name", "discovery"),
+}
+
+_STOPWORDS = frozenset({
+    "a", "all", "an", "and", "any", "are", "be", "can", "each", "for", "in", "is", "must", "no",
+    "not", "of", "on", "only", "or", "so", "such", "the", "to", "use", "will", "with", "you", "your",
+})
+_LINK = re.compile(r"\(https?://\S+?\)")
+_WORD = re.compile(r"[^\W_]+")
+_TITLE_WEIGHT = 3
+_KEYWORD_WEIGHT = 3
+_BODY_WEIGHT = 1
+
+
+def _tokens(text):
+    """
+    Casefolded words of `text` without links or stopwords, with a plural "s" dropped.
+    """
+    words = _WORD.findall(_LINK.sub(" ", text).casefold())
+    return [w[:-1] if len(w) > 3 and w.endswith("s") else w for w in words if w not in _STOPWORDS]
+
+
+class RuleBook:
+    """
+    The rule summaries, with every embed built once and a keyword index over them.
+
+    `embed(number)` hands out the same prebuilt Embed each time. `search`
+    does one dict lookup per query word against an inverted index of rule
+    titles, rule text and RULE_KEYWORDS, and ranks rules by summed weight.
+    A RuleBook is never modified; `with_overrides` builds a new one for the
+    cog to swap in.
+    """
+
+    def __init__(self, rules=None, overrides=None):
+        self.base = dict(RULES if rules is None else rules)
+        self.overrides = {int(k): v for k, v in (overrides or {}).items() if int(k) in self.base}
+        self.texts = {number: self.overrides.get(number, text) for number, text in self.base.items()}
+        self.embeds = {
+            number: discord.Embed(title="Full Rules", url=RULES_URL, description=text, color=discord.Color.orange())
+            for number, text in self.texts.items()
+        }
+        # word -> {rule number: weight}
+        self.index = {}
+        for number, text in self.texts.items():
+            title, _, body = text.partition("\n")
+            weights = Counter()
+            for word in _tokens(title):
+                weights[word] = max(weights[word], _TITLE_WEIGHT)
+            for word in _tokens(" ".join(RULE_KEYWORDS.get(number, ()))):
+                weights[word] = max(weights[word], _KEYWORD_WEIGHT)
+            for word in _tokens(body):
+                weights[word] = max(weights[word], _BODY_WEIGHT)
+            for word, weight in weights.items():
+                self.index.setdefault(word, {})[number] = weight
+
+    def __len__(self):
+        return len(self.texts)
+
+    def title(self, number):
+        title = self.texts[number].partition("\n")[0]
+        return title.strip("*").strip()
+
+    def embed(self, number):
+        """
+        Return the prebuilt embed for rule `number`, or None.
+        """
+        return self.embeds.get(number)
+
+    def search(self, query):
+        """
+        Return `[(rule number, score)]` for a keyword query, best first.
+        """
+        scores = Counter()
+        for word in _tokens(query):
+            for number, weight in self.index.get(word, {}).items():
+                scores[number] += weight
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def lookup(self, query):
+        """
+        Resolve `-rule <query>`: returns `(embed, [])` for a single answer,
+        `(None, [rule numbers])` when several rules fit about equally, or
+        `(None, [])` when nothing does.
+        """
+        query = query.strip()
+        if query.isdecimal():
+            return self.embed(int(query)), []
+        ranked = self.search(query)
+        if not ranked:
+            return None, []
+        if len(ranked) == 1 or ranked[0][1] > ranked[1][1]:
+            return self.embed(ranked[0][0]), []
+        return None, [number for number, _ in ranked[:3]]
+
+    def with_overrides(self, overrides):
+        return RuleBook(self.base, overrides)
+
+
+async def send_rule(reply, rules, query):
+    """
+    Answer `-rule <query>` from `rules` through `reply`, an async callable
+    taking the same arguments as `Messageable.send`.
+    """
+    embed, candidates = rules.lookup(query)
+    if embed is not None:
+        await reply(embed=embed)
+    elif candidates:
+        options = ", ".join(f"**{number}** {rules.title(number)}" for number in candidates)
+        await reply(f"Several rules match that: {options}. Use the rule number to pick one.")
+    else:
+        await reply(f"No rule matches that. Use 1–{len(rules)} or a keyword.")
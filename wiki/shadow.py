@@ -0,0 +1,101 @@
+import json
+import logging
+import time
+from collections import Counter, deque
+from logging.handlers import RotatingFileHandler
+
+from .perf import Histogram
+
+log = logging.getLogger("red.Wiki.shadow")
+# Disagreement samples go to their own size-capped file, not the bot log.
+samples_log = logging.getLogger("red.Wiki.shadow.samples")
+samples_log.propagate = False
+samples_log.setLevel(logging.INFO)
+
+
+class ShadowComparator:
+    """
+    Runs a primary and a shadow lfg detection path on the same message and
+    keeps score.
+
+    Each path is a callable `(guild, content) -> (role name, channel id)`
+    with no side effects. Agreement means the same role and the same target
+    channel. Latency per path goes into a histogram; disagreements are kept
+    in a bounded in-memory ring and, once `open_log` is called, appended to
+    a rotating JSON-lines file that never grows past `max_bytes` * 2.
+    """
+
+    def __init__(self, max_samples: int = 100):
+        self.stats = Counter()
+        self.latency = {"primary": Histogram(), "shadow": Histogram()}
+        self.samples = deque(maxlen=max_samples)
+        self._handler = None
+
+    def open_log(self, path, max_bytes: int = 256 * 1024):
+        self.close_log()
+        self._handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=1, encoding="utf-8")
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+        samples_log.addHandler(self._handler)
+
+    def close_log(self):
+        if self._handler is not None:
+            samples_log.removeHandler(self._handler)
+            self._handler.close()
+            self._handler = None
+
+    def reset(self):
+        self.stats.clear()
+        self.latency = {"primary": Histogram(), "shadow": Histogram()}
+        self.samples.clear()
+
+    def _run(self, name, path, guild, content):
+        start = time.perf_counter()
+        try:
+            return path(guild, content)
+        finally:
+            self.latency[name].observe(time.perf_counter() - start)
+
+    def compare(self, guild, content, primary, shadow):
+        """
+        Run both paths on `content` and record the outcome. Returns True if they agree.
+        """
+        self.stats["runs"] += 1
+        expected = self._run("primary", primary, guild, content)
+        try:
+            actual = self._run("shadow", shadow, guild, content)
+        except Exception:
+            self.stats["shadow_errors"] += 1
+            log.exception("Shadow lfg detection failed.")
+            return False
+        if expected == actual:
+            self.stats["agree"] += 1
+            return True
+        if expected[0] != actual[0]:
+            self.stats["role_mismatch"] += 1
+        else:
+            self.stats["channel_mismatch"] += 1
+        sample = {
+            "at": time.time(),
+            "guild_id": guild.id,
+            "content": content[:500],
+            "primary": {"role": expected[0], "channel_id": expected[1]},
+            "shadow": {"role": actual[0], "channel_id": actual[1]},
+        }
+        self.samples.append(sample)
+        if self._handler is not None:
+            samples_log.info(json.dumps(sample, ensure_ascii=False))
+        return False
+
+    def summary(self):
+        runs = self.stats["runs"]
+        return {
+            "runs": runs,
+            "agreement": self.stats["agree"] / runs if runs else None,
+            "role_mismatch": self.stats["role_mismatch"],
+            "channel_mismatch": self.stats["channel_mismatch"],
+            "shadow_errors": self.stats["shadow_errors"],
+            "latency": {
+                name: {f"p{p}": h.percentile(p) for p in (50, 95, 99)}
+                for name, h in self.latency.items()
+            },
+        }
@@ -1,218 +1,219 @@
+import asyncio
 import discord
-import string
-import re
-import traceback
-from discord.utils import utcnow
-from datetime import datetime, timedelta
-from redbot.core import commands
+import os
+import time
+from functools import partial
+from redbot.core import Config, commands
+from redbot.core.data_manager import cog_data_path
+from redbot.core.utils.chat_formatting import box, pagify
 import logging
 
+from .auth import RoleAuthorizer
+from .capabilities import CapabilityCache
+from .fafo import WARNING_LIFETIME, ExpiryScheduler, FafoBatcher, FafoButton
+from .fanout import BackgroundTasks, gather_steps
+from .game_maps import GameMaps
+from .games import ALLOWED_ROLES, GameRegistry
+from .guild_index import GuildIndexCache
+from .outbound import OutboundScheduler
+from .passive import PassiveDetector
+from .perf import PerfRegistry, format_ms
+from .references import ReferenceResolver
+from .rules import RuleBook, send_rule
+from .shadow import ShadowComparator
+
 log = logging.getLogger("red.Wiki")
 
-class FafoView(discord.ui.View):
-    def __init__(self, timeout: int = 180):
-        super().__init__(timeout=timeout)
-        self.message = None
 
-    async def on_timeout(self):
-        if self.message:
-            try:
-                await self.message.delete()
-            except Exception as e:
-                log.warning(f"Failed to delete FAFO message on timeout: {e}")
+def staff_or_owner():
+    """
+    Command check: the bot owner, or a member with one of the cog's allowed roles.
+    """
+    async def predicate(ctx):
+        if await ctx.bot.is_owner(ctx.author):
+            return True
+        return await ctx.cog.is_authorized(ctx)
 
-    @discord.ui.button(label="FAFO", style=discord.ButtonStyle.danger)
-    async def fafo_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        try:
-            await interaction.response.defer(ephemeral=True)
-            duration = timedelta(minutes=5)
-            until_time = utcnow() + duration
-            member = interaction.guild.get_member(interaction.user.id)
-
-            if member is None:
-                await interaction.followup.send("Member not found.", ephemeral=True)
-                return
-
-            await member.timeout(until_time, reason="FAFO button clicked.")
-            await interaction.followup.send("You have been timed out for 5 minutes.", ephemeral=True)
-
-        except discord.Forbidden:
-            await interaction.followup.send(
-                "I don't have permission to timeout you. Please check my role position and permissions.",
-                ephemeral=True
-            )
-        except discord.HTTPException as http_err:
-            log.exception("HTTP error during FAFO timeout.")
-            await interaction.followup.send(f"An error occurred: {http_err}", ephemeral=True)
-        except Exception as e:
-            log.exception("Unexpected error occurred in FAFO button.")
-            await interaction.followup.send("An unexpected error occurred while processing FAFO.", ephemeral=True)
+    return commands.check(predicate)
 
 class Wiki(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        # Allowed roles that may invoke these commands
-        self.allowed_roles = [
-            "Game Server Team", "Advisors", "Wardens", "The Brute Squad", "Sentinels",
-            "Community Manager - Helldivers", "Community Manager - Book Club",
-            "Community Manager - Call of Duty", "Community Manager - D&D",
-            "Community Manager - World of Warcraft", "Community Manager - Minecraft",
-            "Skye", "Librarian Raccoon", "Zara", "BadgerSnacks", "Donnie",
-            "Captain Sawbones", "Captain Soulo"
-        ]
-        # Maps common game aliases (all lowercase) to the exact role name.
-        self.alias_to_role = {
-            "7dtd": "7 Days To Die", "ark": "ARK", "aoe": "Age of Empires", "amongus": "Among Us",
-            "acnh": "Animal Crossing", "apex": "Apex Legends", "assetto": "Assetto Corsa",
-            "b4b": "Back 4 Blood", "bf": "Battlefield", "bg3": "Baldur's Gate 3", "cod": "Call of Duty",
-            "cw": "Content Warning", "dayz": "DayZ", "dbd": "Dead by Daylight", "drg": "Deep Rock Galactic",
-            "demo": "Demonologist", "d2": "Destiny 2", "diablo": "Diablo", "dirt": "DiRT",
-            "ddv": "Disney Dreamlight Valley", "dnd": "Dungeons&Dragons", "d&d": "Dungeons&Dragons",
-            "dungeons": "Dungeons&Dragons", "biweekly": "D&D Biweekly Players", "dragonage": "Dragon Age",
-            "dyinglight": "Dying Light", "eldenring": "Elden Ring", "eso": "Elder Scrolls",
-            "elite": "Elite Dangerous", "enshrouded": "Enshrouded", "eft": "Escape from Tarkov",
-            "tarkov": "Escape from Tarkov", "fallout": "Fallout", "farmingsim": "Farming sim",
-            "ffxiv": "Final Fantasy XIV", "descendant": "The First Descendant", "fivem": "FiveM",
-            "honor": "For Honor", "fn": "Fortnite", "forza": "Forza", "genshin": "Genshin Impact",
-            "recon": "Ghost Recon", "goose": "Goose Goose Duck", "gta": "Grand Theft Auto V",
-            "halo": "Halo", "hll": "Hell Let Loose", "helldivers": "Helldivers 2",
-            "hogwarts": "Hogwarts Legacy", "jackbox": "Jackbox", "lol": "League of Legends",
-            "lethal": "Lethal Company", "lockdown": "Lockdown Protocol", "lostark": "Lost Ark",
-            "mtg": "Magic: The Gathering", "mariokart": "Mario Kart", "marvel": "Marvel Rivals",
-            "mc": "Minecraft", "monsterhunter": "Monster Hunter", "mk": "Mortal Kombat",
-            "nms": "No Man's Sky", "oncehuman": "Once Human", "ow": "Overwatch", "ow2": "Overwatch",
-            "palia": "Palia", "palworld": "Palworld", "poe": "Path of Exile", "pavlov": "Pavlov",
-            "phasmophobia": "Phasmophobia", "pubg": "Player Unknown Battlegrounds",
-            "pokemon": "Pokémon", "raft": "Raft", "rainbow": "Rainbow Six", "r6": "Rainbow Six",
-            "ron": "Ready Or Not", "readyornot": "Ready Or Not", "rdo": "Red Dead: Online", "repo": "R.E.P.O", "rl": "Rocket League",
-            "runescape": "RuneScape", "rust": "Rust", "satisfactory": "Satisfactory",
-            "sot": "Sea of Thieves", "sims": "The Sims", "sm2": "Space Marines 2", "sc": "Star Citizen",
-            "stardew": "Stardew Valley", "starfield": "Starfield", "ssb": "Super Smash Bros.",
-            "division": "The Division", "tinytina": "Tiny Tina's Wonderlands", "trucksim": "Truck Simulator",
-            "valheim": "Valheim", "val": "Valorant", "warframe": "Warframe", "warthunder": "War Thunder",
-            "wot": "World of Tanks", "wow": "World of Warcraft"
-        }
-
-        self.role_name_to_channel_id = {
-            "Escape from Tarkov": 1325558852120350863,
-            "Table-Top Simulator": 1217529197594021889,
-            "Warhammer 40k": 1217529421863456928,
-            "Elden Ring": 1315179628993839155,
-            "Baldur's Gate 3": 1315180707685073028, 
-            "Final Fantasy": 1328766811671498833,
-            "Assetto Corsa": 1315312906178396180,
-            "League of Legends": 1308589894268092476,
-            "Dota 2": 1308590005911814224,
-            "Smite": 1308590072689590374,
-            "Wild Rift": 1316230560946982942,
-            "iRacing": 1328799846341148672,
-            "Animal Crossing": 1356280246587883551, #Animal Crossing
-            "Age of Empires ": 1021071580375302144, #RTS
-            "Among Us": 1187881125813698611, #Party
-            "Apex Legends": 1021071765994209451, #Battle Royale
-            "Back 4 Blood": 1147172129658372239, #FPS 
-            "Battlefield": 1147172129658372239,  #FPS
-            "Baldur's Gate": 1315180707685073028, #Baldur's Gate
-            "Call of Duty": 1067440688737820683, #COD-General 
-            "Content Warning": 1187881125813698611, #Party
-            "DayZ": 934224139181502524, #Survival-Craft
-            "Dead By Daylight": 934226974468112434, #Horror
-            "Deep Rock Galactic": 1147172129658372239, #FPS
-            "Demonologist": 934226974468112434, #Horror
-            "Destiny 2": 1108432769505308702, #The Tower
-            "Diablo": 1123047882669436958, #All Diablo Chat
-            "Disney Dreamlight Valley": 1354469688582602993, #Dreamlight channel
-            "Dungeons&Dragons": 933541913167024189, #The Tavern
-            "D&D Biweekly Players": 1064988631305040063, #Adventurers Guild
-            "Dragon Age": 1215035228364603552, #RPG Games
-            "Dying Light": 934226974468112434, #Horror
-            "Elden Ring": 1315179628993839155, #Elden Ring
-            "Elder Scrolls": 1215035228364603552, #RPG Games
-            "Elite Dangerous": 1021072931947819049, #Space & Flight Games
-            "Enshrouded": 934224139181502524, #Survival-Craft
-            "Escape from Tarkov": 1325558852120350863, #Escape From Tarkov
-            "Fallout": 1215035228364603552, #RPG Games
-            "Farming sim": 1318215079736381460, #Farming Sim
-            "Final Fantasy XIV": 1328766811671498833, #Final Fantasy
-            "The First Descendant": 1147172129658372239, #FPS
-            "FiveM": 1215035228364603552, #RPG Games
-            "For Honor": 1021075894120480818, #Fighting Games
-            "Fortnite": 1316416079333167149, #Fortnite General
-            "Forza": 1328799912892170260, #Forza
-            "Genshin Impact": 1215035228364603552, #RPG Games
-            "Ghost Recon": 1021075269886414849, #third-person shooter
-            "Goose Goose Duck": 1187881125813698611, #Party
-            "Grand Theft Auto V": 1147172129658372239, #FPS
-            "Halo": 1147172129658372239, #FPS
-            "Hell Let Loose": 1325565264246603859, #Hell Let Loose
-            "Helldivers 2": 1215290878973972481, # Helldivers
-            "Hogwarts Legacy": 1215035228364603552, #RPG Games (I'm so lost)
-            "Jackbox": 1187881125813698611, #Party
-            "League of Legends": 1308589894268092476, #League of Legends
-            "Lethal Company": 934226974468112434, #Horror
-            "Lockdown Protocol": 1187881125813698611, #Party
-            "Lost Ark": 1215035228364603552, #RPG Games (Maybe? Kind of?)
-            "Magic: The Gathering": 1065493485714686003, #Magic channel
-            "Mario Kart": 1021073264493211739, #Racing Games
-            "Marvel Rivals": 1318214983670042707,
-            "Minecraft": 1109614662594613298, #Minecraft General
-            "Monster Hunter": 1315178720364859402, #Monster Hunter
-            "Mortal Kombat": 1021075894120480818, #Fighting Games
-            "No Man's Sky": 1021072931947819049, #Space & Flight Games
-            "Once Human": 1021075269886414849, #third-person shooter
-            "Overwatch": 1318215028494831697, #Overwatch?
-            "Palia": 1318220176981889187, #Palia
-            "Palworld": 934224139181502524, #Survival-Craft
-            "Path of Exile": 1205575608231530506, #PoE
-            "Path of Exile 2": 1310386526093578251, #PoE2
-            "Pavlov": 933461190582091887, #VR
-            "Player Unknown Battlegrounds": 1021071765994209451, #Battle Royale
-            "Pokémon": 1065621451417337956,
-            "Raft": 934224139181502524, #Survival-Craft
-            "Rainbow Six": 1325558740086161428, #Rainbow Six
-            "Ready Or Not": 1325558905907970199, #RoN
-            "Red Dead: Online": 1215035228364603552, #RPG Games
-            "R.E.P.O": 1351009382154109018, #Repo
-            "Rocket League": 1021076388406632468, #Sports
-            "RuneScape": 1215035228364603552, #RPG Games
-            "Rust": 934224139181502524, #Survival-Craft
-            "Satisfactory": 934224139181502524, #Survival-Craft (Cozy games has been argued)
-            "Sea of Thieves": 1215035228364603552, #RPG Games (This is the biggest shot in the dark)
-            "The Sims": 1356280039603437749, #Cozy General
-            "Space Marines 2": 1021075269886414849, #third-person shooter
-            "Star Citizen": 1021072931947819049, #Space & Flight Games
-            "Stardew Valley": 1356280039603437749, #Cozy General
-            "Starfield": 1215035228364603552, #RPG Games
-            "Super Smash Bros.": 1021075894120480818, #Fighting Games
-            "The Division": 1021075269886414849, #third-person shooter
-            "Tiny Tina's Wonderlands": 1147172129658372239, #FPS
-            "Truck Simulator": 1192812670592749710, #Simulation Games
-            "Valheim": 934224139181502524, #Survival-Craft 
-            "Valorant": 1147172129658372239, #FPS
-            "Warframe": 1021075269886414849, #third-person shooter
-            "War Thunder": 1325565211884781588,
-            "World of Tanks": 1192812670592749710, #Simulation Games
-            "World of Warcraft": 1067440649479131187 #Wow General
-        }
+        self.config = Config.get_conf(self, identifier=274661290, force_registration=True)
+        self.config.register_guild(
+            allowed_role_ids=None, passive_channels=[], game_aliases=None, game_channels=None
+        )
+        self.config.register_global(fafo_expiry=[], perf_dump_interval=0, shadow_mode=False, rule_text={})
+        # Allowed roles are resolved to role IDs per guild; verdicts are cached per member.
+        self.auth = RoleAuthorizer(self.config, ALLOWED_ROLES)
+        # Shared alias/channel tables with normalized lookups.
+        self.games = GameRegistry()
+        # Per-guild copies of those tables that staff can edit; lookups stay in memory.
+        self.game_maps = GameMaps(self.config, self.games)
+        # Per-guild role/channel lookups, rebuilt when roles or channels change.
+        self.guild_index = GuildIndexCache(self.games)
+        # Finds replied-to messages from the payload or caches before using REST.
+        self.references = ReferenceResolver()
+        # Side effects nobody waits on, such as deleting the command message.
+        self.background = BackgroundTasks()
+        # What the bot may do per guild, checked locally before role and timeout requests.
+        self.capabilities = CapabilityCache()
+        # FAFO clicks (routed here by FafoButton's custom_id) handled in paced per-guild batches,
+        # and one task that deletes expired warnings.
+        self.fafo_batcher = FafoBatcher(capabilities=self.capabilities)
+        self.fafo_expiry = ExpiryScheduler(bot, self.config.fafo_expiry)
+        # Latency histograms per command phase, shown by perfstats.
+        self.perf = PerfRegistry("wiki")
+        self._perf_dumper = None
+        # Paced, per-channel sends for the LFG pings; pings for one role in a short window are merged.
+        self.outbound = OutboundScheduler(perf=self.perf)
+        # Optional side-by-side run of the beta cog's lfg detection on every real lfg.
+        self.shadow = ShadowComparator()
+        self.shadow_enabled = False
+        # Opt-in nudges for lfg-style chat; guild id -> channel ids it listens in.
+        self.passive = PassiveDetector()
+        self.passive_channels = {}
+        # Rule embeds and keyword index, built once; edits build a new RuleBook and swap it in.
+        self.rules = RuleBook()
         # Use Discord's internal format for the Channels & Roles link.
         self.channels_and_roles_link = "<id:customize>"
 
-    def is_authorized(self, ctx):
+    async def is_authorized(self, ctx):
         """
         Return True if the invoking user has one of the allowed roles.
         """
-        return any(role.name in self.allowed_roles for role in ctx.author.roles)
+        if ctx.guild is None:
+            return False
+        return await self.auth.is_authorized(ctx.author)
+
+    async def cog_load(self):
+        self.bot.add_dynamic_items(FafoButton)
+        await self.fafo_expiry.start()
+        await self.game_maps.load()
+        self.rules = self.rules.with_overrides(await self.config.rule_text())
+        self._start_perf_dumper(await self.config.perf_dump_interval())
+        self.shadow_enabled = await self.config.shadow_mode()
+        self.shadow.open_log(cog_data_path(self) / "shadow_disagreements.jsonl")
+        for guild_id, data in (await self.config.all_guilds()).items():
+            if data.get("passive_channels"):
+                self.passive_channels[guild_id] = frozenset(data["passive_channels"])
+
+    def cog_unload(self):
+        if self._perf_dumper is not None:
+            self._perf_dumper.cancel()
+        self.shadow.close_log()
+        self.bot.remove_dynamic_items(FafoButton)
+        self.fafo_expiry.stop()
+        self.fafo_batcher.cancel_all()
+        self.outbound.cancel_all()
+        self.background.cancel_all()
+
+    async def cog_before_invoke(self, ctx):
+        ctx.perf_started = time.perf_counter()
+
+    async def cog_after_invoke(self, ctx):
+        started = getattr(ctx, "perf_started", None)
+        if started is not None:
+            self.perf.observe(f"cmd.{ctx.command.qualified_name}", time.perf_counter() - started)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        self.guild_index.invalidate(role.guild.id)
+        self.capabilities.invalidate(role.guild.id)
+        self.auth.roles_changed(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        self.guild_index.invalidate(after.guild.id)
+        self.capabilities.invalidate(after.guild.id)
+        self.auth.roles_changed(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self.guild_index.invalidate(role.guild.id)
+        self.capabilities.invalidate(role.guild.id)
+        self.auth.invalidate_guild(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if before.roles != after.roles:
+            self.auth.invalidate_member(after.guild.id, after.id)
+            if after.id == self.bot.user.id:
+                self.capabilities.invalidate(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before, after):
+        # Ownership transfers change who can be timed out.
+        self.capabilities.invalidate(after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self.guild_index.invalidate(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        self.guild_index.invalidate(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.guild_index.invalidate(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        self.references.mark_missing(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload):
+        self.references.forget(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.guild_index.invalidate(guild.id)
+        self.capabilities.invalidate(guild.id)
+        self.auth.invalidate_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        # Most messages stop at the first check; keep anything awaited below the detector.
+        if message.guild is None or message.author.bot:
+            return
+        channels = self.passive_channels.get(message.guild.id)
+        if not channels or message.channel.id not in channels:
+            return
+        games = self.game_maps.get(message.guild)
+        with self.perf.timer("passive.scan"):
+            role_name = self.passive.check(games, message.content, message.channel.id, message.author.id)
+        if role_name is None:
+            return
+        if await self.bot.cog_disabled_in_guild(self, message.guild):
+            return
+        if not await self.bot.ignored_channel_or_guild(message):
+            return
+        index = self.guild_index.get(message.guild, games)
+        role = index.role(role_name)
+        role_name = role.name if role else role_name
+        target_channel = index.channel_for_role(role_name)
+        # Nothing to point at, or they're already in the right place.
+        if target_channel is None or target_channel.id == message.channel.id:
+            return
+        self.passive.mark(message.channel.id, message.author.id)
+        text = (
+            f"Looking for a group for **{role_name}**? Head over to {target_channel.mention}, "
+            f"and grab the role from {self.channels_and_roles_link} to get pinged when people are playing."
+        )
+        self.background.spawn(
+            self.perf.timed("send.passive", message.reply(text, mention_author=False)), "passive lfg nudge"
+        )
 
     async def delete_and_check(self, ctx):
         """
         Delete the invoking message and return True if the user is authorized.
+        The delete runs in the background so the command doesn't wait on it.
         """
-        try:
-            await ctx.message.delete()
-        except discord.Forbidden:
-            pass
-        if not self.is_authorized(ctx):
-            return False
+        self.background.spawn(self.perf.timed("delete", ctx.message.delete()), "delete command message")
+        with self.perf.timer("auth"):
+            if not await self.is_authorized(ctx):
+                return False
         return True
 
     async def send_reply(self, ctx, *args, **kwargs):
@@ -223,14 +224,507 @@ class Wiki(commands.Cog):
         """
         if ctx.message.reference:
             try:
-                original_message = await ctx.channel.fetch_message(ctx.message.reference.message_id)
-                msg = await original_message.reply(*args, **kwargs)
-                return msg
+                original_message = await self.perf.timed("reference", self.references.resolve(ctx.message))
+                if original_message is not None:
+                    msg = await self.perf.timed("send.reply", original_message.reply(*args, **kwargs))
+                    return msg
             except Exception:
                 pass
-        msg = await ctx.send(*args, **kwargs)
+        msg = await self.perf.timed("send.channel", ctx.send(*args, **kwargs))
         return msg
 
+    @commands.group(name="wikiallow")
+    @commands.guild_only()
+    @commands.is_owner()
+    async def wikiallow(self, ctx):
+        """
+        🔐 Show or edit which roles may use the wiki commands in this server.
+        """
+        if ctx.invoked_subcommand is None:
+            await ctx.send_help()
+
+    @wikiallow.command(name="list")
+    async def wikiallow_list(self, ctx):
+        """
+        List the roles currently allowed to use the wiki commands.
+        """
+        allowed = await self.auth.allowed_ids(ctx.guild)
+        if not allowed:
+            await ctx.send("No roles are allowed yet.")
+            return
+        lines = []
+        for role_id in sorted(allowed):
+            role = ctx.guild.get_role(role_id)
+            lines.append(f"- {role.name} (`{role_id}`)" if role else f"- Deleted role (`{role_id}`)")
+        await ctx.send("Allowed roles:\n" + "\n".join(lines))
+
+    @wikiallow.command(name="add")
+    async def wikiallow_add(self, ctx, *, role: discord.Role):
+        """
+        Allow a role to use the wiki commands.
+        """
+        allowed = await self.auth.allowed_ids(ctx.guild)
+        await self.auth.set_allowed(ctx.guild, allowed | {role.id})
+        await ctx.send(f"**{role.name}** can now use the wiki commands.")
+
+    @wikiallow.command(name="remove")
+    async def wikiallow_remove(self, ctx, *, role: discord.Role):
+        """
+        Stop a role from using the wiki commands.
+        """
+        allowed = await self.auth.allowed_ids(ctx.guild)
+        await self.auth.set_allowed(ctx.guild, allowed - {role.id})
+        await ctx.send(f"**{role.name}** can no longer use the wiki commands.")
+
+    @wikiallow.command(name="reset")
+    async def wikiallow_reset(self, ctx):
+        """
+        Go back to the default staff role list.
+        """
+        await self.auth.reset(ctx.guild)
+        await ctx.send("Allowed roles reset to the defaults.")
+
+    @commands.command(name="wikicaps")
+    @commands.guild_only()
+    @commands.is_owner()
+    async def wikicaps(self, ctx):
+        """
+        🩺 Show what the bot may do here: role and timeout permissions, and game roles it can't hand out.
+        """
+        self.capabilities.invalidate(ctx.guild.id)
+        caps = self.capabilities.get(ctx.guild)
+        if not caps.known:
+            await ctx.send("My member isn't cached in this server yet; try again in a moment.")
+            return
+        yes_no = {True: "✅", False: "❌"}
+        lines = [
+            f"{yes_no[caps.manage_roles]} Manage Roles",
+            f"{yes_no[caps.moderate_members]} Moderate Members (FAFO timeouts)",
+            f"Top role: **{caps.top_role_name}** (position {caps.top_position})",
+        ]
+        games = self.game_maps.get(ctx.guild)
+        index = self.guild_index.get(ctx.guild, games)
+        blocked = []
+        for role_name in sorted(set(games.roles.values())):
+            role = index.role(role_name)
+            if role is None:
+                continue
+            ok, why_not = caps.can_assign(role)
+            if not ok:
+                blocked.append(f"- {why_not}")
+        if blocked:
+            lines.append(f"Game roles I can't give out ({len(blocked)}):")
+            lines.extend(blocked[:20])
+            if len(blocked) > 20:
+                lines.append(f"...and {len(blocked) - 20} more.")
+        else:
+            lines.append("I can give out every game role.")
+        denied = self.capabilities.denied
+        lines.append(f"Requests skipped by pre-flight checks: {denied['add role']} role adds, {denied['timeout']} timeouts.")
+        await ctx.send("\n".join(lines))
+
+    async def _set_passive_channels(self, guild, channel_ids):
+        await self.config.guild(guild).passive_channels.set(sorted(channel_ids))
+        if channel_ids:
+            self.passive_channels[guild.id] = frozenset(channel_ids)
+        else:
+            self.passive_channels.pop(guild.id, None)
+
+    @commands.group(name="wikipassive")
+    @commands.guild_only()
+    @commands.is_owner()
+    async def wikipassive(self, ctx):
+        """
+        👂 Show or edit the channels where lfg-style chat gets a nudge toward the game's channel.
+        """
+        if ctx.invoked_subcommand is None:
+            await ctx.send_help()
+
+    @wikipassive.command(name="list")
+    async def wikipassive_list(self, ctx):
+        """
+        List the channels being watched, with detector counters.
+        """
+        channel_ids = self.passive_channels.get(ctx.guild.id)
+        if not channel_ids:
+            await ctx.send("Passive lfg detection is off in this server.")
+            return
+        lines = []
+        for channel_id in sorted(channel_ids):
+            channel = ctx.guild.get_channel(channel_id)
+            lines.append(f"- {channel.mention}" if channel else f"- Deleted channel (`{channel_id}`)")
+        stats = self.passive.stats
+        lines.append(
+            f"Seen {stats['seen']} messages: {stats['matched']} matched, {stats['nudged']} nudged, "
+            f"{stats['cooldown']} on cooldown, {stats['budget_overrun']} over the time budget."
+        )
+        await ctx.send("Watching:\n" + "\n".join(lines))
+
+    @wikipassive.command(name="add")
+    async def wikipassive_add(self, ctx, *, channel: discord.TextChannel):
+        """
+        Start watching a channel.
+        """
+        channel_ids = set(self.passive_channels.get(ctx.guild.id, ()))
+        await self._set_passive_channels(ctx.guild, channel_ids | {channel.id})
+        await ctx.send(f"Watching {channel.mention} for lfg-style chat.")
+
+    @wikipassive.command(name="remove")
+    async def wikipassive_remove(self, ctx, *, channel: discord.TextChannel):
+        """
+        Stop watching a channel.
+        """
+        channel_ids = set(self.passive_channels.get(ctx.guild.id, ()))
+        await self._set_passive_channels(ctx.guild, channel_ids - {channel.id})
+        await ctx.send(f"No longer watching {channel.mention}.")
+
+    @commands.group(name="wikigames", invoke_without_command=True)
+    @commands.guild_only()
+    @staff_or_owner()
+    async def wikigames(self, ctx):
+        """
+        🎮 Show or edit this server's game aliases and LFG channels.
+        """
+        games = self.game_maps.get(ctx.guild)
+        source = "this server's own tables" if self.game_maps.customized(ctx.guild) else "the built-in tables"
+        lines = [
+            f"Using {source}: {len(games.aliases)} aliases for {len(set(games.aliases.values()))} games, "
+            f"{len(games.channels)} LFG channels."
+        ]
+        if games.problems:
+            lines.append(f"{len(games.problems)} problem(s):")
+            lines.extend(f"- {problem}" for problem in games.problems[:15])
+            if len(games.problems) > 15:
+                lines.append(f"...and {len(games.problems) - 15} more.")
+        lines.append(f"See `{ctx.clean_prefix}help wikigames` for the editing commands.")
+        for page in pagify("\n".join(lines)):
+            await ctx.send(page)
+
+    @wikigames.command(name="list")
+    async def wikigames_list(self, ctx):
+        """
+        List every game with its aliases and LFG channel.
+        """
+        games = self.game_maps.get(ctx.guild)
+        by_role = {}
+        for alias, role_name in games.aliases.items():
+            by_role.setdefault(role_name, []).append(alias)
+        for role_name in games.unaliased_channels:
+            by_role.setdefault(role_name, [])
+        lines = []
+        for role_name in sorted(by_role, key=str.casefold):
+            channel_id = games.channel_for_role(role_name)
+            channel = f"<#{channel_id}>" if channel_id else "no channel"
+            aliases = ", ".join(sorted(by_role[role_name])) or "no aliases"
+            lines.append(f"**{role_name}** ({channel}): {aliases}")
+        for page in pagify("\n".join(lines)):
+            await ctx.send(page)
+
+    async def _report_games(self, ctx, message):
+        problems = self.game_maps.get(ctx.guild).problems
+        if problems:
+            message += f"\nThe tables now have {len(problems)} problem(s); `{ctx.clean_prefix}wikigames` lists them."
+        await ctx.send(message)
+
+    @wikigames.command(name="alias")
+    async def wikigames_alias(self, ctx, alias: str, *, role: discord.Role):
+        """
+        Point an alias at a game role, adding it or remapping it. Quote aliases with spaces.
+        """
+        previous = await self.game_maps.set_alias(ctx.guild, alias, role.name)
+        if previous is None:
+            await self._report_games(ctx, f"`{alias}` now means **{role.name}**.")
+        else:
+            await self._report_games(ctx, f"`{alias}` now means **{role.name}** instead of **{previous}**.")
+
+    @wikigames.command(name="unalias")
+    async def wikigames_unalias(self, ctx, *, alias: str):
+        """
+        Remove an alias.
+        """
+        previous = await self.game_maps.remove_alias(ctx.guild, alias)
+        if previous is None:
+            await ctx.send(f"`{alias}` isn't an alias here.")
+            return
+        await self._report_games(ctx, f"Removed `{alias}` (was **{previous}**).")
+
+    @wikigames.command(name="channel")
+    async def wikigames_channel(self, ctx, channel: discord.TextChannel, *, role: discord.Role):
+        """
+        Set the LFG channel for a game role.
+        """
+        previous = await self.game_maps.set_channel(ctx.guild, role.name, channel.id)
+        moved = f" (was <#{previous}>)" if previous and previous != channel.id else ""
+        await self._report_games(ctx, f"**{role.name}** LFG now goes to {channel.mention}{moved}.")
+
+    @wikigames.command(name="unchannel")
+    async def wikigames_unchannel(self, ctx, *, role_name: str):
+        """
+        Remove a game's LFG channel. Takes the role name, so deleted roles can be cleaned up too.
+        """
+        previous = await self.game_maps.remove_channel(ctx.guild, role_name)
+        if previous is None:
+            await ctx.send(f"**{role_name}** has no LFG channel here.")
+            return
+        await self._report_games(ctx, f"**{role_name}** no longer has an LFG channel (was <#{previous}>).")
+
+    @wikigames.command(name="reset")
+    async def wikigames_reset(self, ctx):
+        """
+        Throw away this server's edits and go back to the built-in tables.
+        """
+        await self.game_maps.reset(ctx.guild)
+        await ctx.send("Game aliases and channels reset to the built-in tables.")
+
+    @commands.group(name="wikirules", invoke_without_command=True)
+    @staff_or_owner()
+    async def wikirules(self, ctx):
+        """
+        📘 List the rule summaries used by `rule`, marking the edited ones.
+        """
+        lines = []
+        for number in sorted(self.rules.texts):
+            edited = " (edited)" if number in self.rules.overrides else ""
+            lines.append(f"**{number}** {self.rules.title(number)}{edited}")
+        lines.append(f"Edit one with `{ctx.clean_prefix}wikirules set <number> <text>`; the first line is the title.")
+        await ctx.send("\n".join(lines))
+
+    @wikirules.command(name="set")
+    async def wikirules_set(self, ctx, number: int, *, text: str):
+        """
+        Replace a rule's summary. The first line is the title, keep it bold to match the others.
+        """
+        if number not in self.rules.base:
+            await ctx.send(f"There is no rule {number}. Use 1–{len(self.rules)}.")
+            return
+        async with self.config.rule_text() as overrides:
+            overrides[str(number)] = text
+            rules = self.rules.with_overrides(overrides)
+        self.rules = rules
+        await ctx.send(f"Rule {number} updated:", embed=rules.embed(number))
+
+    @wikirules.command(name="reset")
+    async def wikirules_reset(self, ctx, number: int):
+        """
+        Go back to the built-in summary for a rule.
+        """
+        async with self.config.rule_text() as overrides:
+            removed = overrides.pop(str(number), None)
+            rules = self.rules.with_overrides(overrides)
+        self.rules = rules
+        if removed is None:
+            await ctx.send(f"Rule {number} wasn't edited.")
+        else:
+            await ctx.send(f"Rule {number} is back to the built-in summary.")
+
+    def perf_registries(self):
+        """
+        Return `(cog name, PerfRegistry)` for every loaded cog that keeps one.
+        """
+        registries = []
+        for name, cog in sorted(self.bot.cogs.items()):
+            perf = getattr(cog, "perf", None)
+            if perf is not None and hasattr(perf, "snapshot") and hasattr(perf, "prometheus"):
+                registries.append((name, perf))
+        return registries
+
+    def perf_dump_path(self):
+        return cog_data_path(self) / "perf.prom"
+
+    async def write_perf_dump(self, path=None):
+        """
+        Write every cog's histograms to `path` in Prometheus text format and return the path.
+        """
+        path = path or self.perf_dump_path()
+        text = "".join(perf.prometheus() for _, perf in self.perf_registries())
+
+        def write():
+            # Write then rename, so a scraper never reads half a file.
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fp:
+                fp.write(text)
+            os.replace(tmp, path)
+
+        await asyncio.get_running_loop().run_in_executor(None, write)
+        return path
+
+    def _start_perf_dumper(self, interval):
+        if self._perf_dumper is not None:
+            self._perf_dumper.cancel()
+            self._perf_dumper = None
+        if interval > 0:
+            self._perf_dumper = asyncio.create_task(self._perf_dump_loop(interval))
+
+    async def _perf_dump_loop(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.write_perf_dump()
+            except OSError:
+                log.exception("Failed to write the perf dump.")
+
+    @commands.group(name="perfstats", invoke_without_command=True)
+    @commands.is_owner()
+    async def perfstats(self, ctx):
+        """
+        ⏱️ Show p50/p95/p99 latency per command phase for every cog that records them.
+        """
+        lines = []
+        for cog_name, perf in self.perf_registries():
+            snapshot = perf.snapshot()
+            if not snapshot:
+                continue
+            lines.append(f"[{cog_name}]")
+            lines.append(f"{'phase':24} {'count':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)")
+            for phase, stats in snapshot.items():
+                lines.append(
+                    f"{phase[:24]:24} {stats['count']:>7} {format_ms(stats['p50']):>8} {format_ms(stats['p95']):>8} "
+                    f"{format_ms(stats['p99']):>8} {format_ms(stats['max']):>8}"
+                )
+            lines.append("")
+        outbound = self.outbound.stats
+        if outbound["queued"]:
+            lines.append(
+                f"[Wiki outbound] {outbound['pings']} lfg pings, {outbound['coalesced']} merged into earlier ones, "
+                f"{outbound['sent']} sent, {outbound['failed']} failed, {len(self.outbound)} waiting"
+            )
+        if not lines:
+            await ctx.send("Nothing has been timed yet.")
+            return
+        for page in pagify("\n".join(lines), page_length=1900):
+            await ctx.send(box(page))
+
+    @perfstats.command(name="dump")
+    async def perfstats_dump(self, ctx):
+        """
+        Write the histograms to a Prometheus text-format file in the cog's data folder.
+        """
+        try:
+            path = await self.write_perf_dump()
+        except OSError as e:
+            await ctx.send(f"Couldn't write the perf dump: {e}")
+            return
+        await ctx.send(f"Wrote `{path}`.")
+
+    @perfstats.command(name="autodump")
+    async def perfstats_autodump(self, ctx, seconds: int):
+        """
+        Rewrite the Prometheus file every `seconds` seconds; 0 turns it off.
+        """
+        if seconds < 0:
+            await ctx.send("Use 0 to turn it off, or a positive number of seconds.")
+            return
+        await self.config.perf_dump_interval.set(seconds)
+        self._start_perf_dumper(seconds)
+        if seconds:
+            await ctx.send(f"Writing `{self.perf_dump_path()}` every {seconds} seconds.")
+        else:
+            await ctx.send("Automatic perf dumps are off.")
+
+    @perfstats.command(name="reset")
+    async def perfstats_reset(self, ctx):
+        """
+        Clear every cog's histograms.
+        """
+        for _, perf in self.perf_registries():
+            perf.reset()
+        await ctx.send("Perf histograms cleared.")
+
+    def detect_lfg(self, guild, content, games=None):
+        """
+        Return the `(role name, channel id)` lfg would pick for `content`, without sending anything.
+        """
+        if games is None:
+            games = self.game_maps.get(guild)
+        role_name = games.detect(content.lower().replace(" ", ""))
+        if role_name is None:
+            match = games.detect_fuzzy(content)
+            role_name = match.role if match else None
+        if role_name is None:
+            return None, None
+        role = self.guild_index.get(guild, games).role(role_name)
+        if role is None:
+            return role_name, None
+        return role.name, games.channel_for_role(role.name)
+
+    def shadow_lfg(self, guild, content):
+        """
+        Compare this cog's lfg detection with the beta cog's on `content`, off the command's path.
+        """
+        beta = self.bot.get_cog("Wikibeta")
+        if beta is None or not hasattr(beta, "detect_lfg"):
+            return
+
+        # Both paths read the same per-guild tables, so only the detection itself can differ.
+        games = self.game_maps.get(guild)
+
+        async def compare():
+            self.shadow.compare(
+                guild, content, partial(self.detect_lfg, games=games), partial(beta.detect_lfg, games=games)
+            )
+
+        self.background.spawn(compare(), "shadow lfg")
+
+    @commands.group(name="wikishadow", invoke_without_command=True)
+    @commands.is_owner()
+    async def wikishadow(self, ctx):
+        """
+        🔬 Show how the beta lfg detection compares with the live one.
+        """
+        summary = self.shadow.summary()
+        state = "on" if self.shadow_enabled else "off"
+        if not summary["runs"]:
+            await ctx.send(f"Shadow mode is {state}. No lfg commands compared yet.")
+            return
+        latency = summary["latency"]
+        await ctx.send(
+            f"Shadow mode is {state}. Compared {summary['runs']} lfg commands: "
+            f"**{summary['agreement']:.1%}** agree.\n"
+            f"Different role: {summary['role_mismatch']}, same role but different channel: "
+            f"{summary['channel_mismatch']}, beta errors: {summary['shadow_errors']}.\n"
+            f"Live path: p50 {format_ms(latency['primary']['p50'])}ms, p95 {format_ms(latency['primary']['p95'])}ms, "
+            f"p99 {format_ms(latency['primary']['p99'])}ms\n"
+            f"Beta path: p50 {format_ms(latency['shadow']['p50'])}ms, p95 {format_ms(latency['shadow']['p95'])}ms, "
+            f"p99 {format_ms(latency['shadow']['p99'])}ms"
+        )
+
+    @wikishadow.command(name="enable")
+    async def wikishadow_enable(self, ctx, enabled: bool):
+        """
+        Turn shadow comparisons on or off. Needs the wikibeta cog loaded.
+        """
+        await self.config.shadow_mode.set(enabled)
+        self.shadow_enabled = enabled
+        note = "" if self.bot.get_cog("Wikibeta") or not enabled else " The wikibeta cog isn't loaded, so nothing will be compared yet."
+        await ctx.send(f"Shadow mode is now {'on' if enabled else 'off'}.{note}")
+
+    @wikishadow.command(name="samples")
+    async def wikishadow_samples(self, ctx, count: int = 5):
+        """
+        Show the most recent disagreements.
+        """
+        samples = list(self.shadow.samples)[-max(1, min(count, 20)):]
+        if not samples:
+            await ctx.send("No disagreements recorded.")
+            return
+        lines = []
+        for sample in reversed(samples):
+            live, beta = sample["primary"], sample["shadow"]
+            lines.append(
+                f"{sample['content'][:80]!r}\n"
+                f"  live: {live['role']} -> {live['channel_id']}  beta: {beta['role']} -> {beta['channel_id']}"
+            )
+        for page in pagify("\n".join(lines), page_length=1900):
+            await ctx.send(box(page))
+
+    @wikishadow.command(name="reset")
+    async def wikishadow_reset(self, ctx):
+        """
+        Clear the comparison counters and samples.
+        """
+        self.shadow.reset()
+        await ctx.send("Shadow comparison data cleared.")
+
     @commands.command(name="lfg")
     async def lfg(self, ctx):
         """
@@ -241,7 +735,10 @@ class Wiki(commands.Cog):
         if not await self.delete_and_check(ctx):
             return
 
+        # One snapshot of the game tables for the whole command, even if staff edit them meanwhile.
+        games = self.game_maps.get(ctx.guild)
         role_mention = None
+        fuzzy_match = None
         mention_text = ""
         extra_text = ""
         replied_user = ctx.author  # default fallback
@@ -250,80 +747,84 @@ class Wiki(commands.Cog):
         # Attempt to get role info from the referenced message.
         if ctx.message.reference:
             try:
-                replied = await ctx.channel.fetch_message(ctx.message.reference.message_id)
-                content = replied.content.lower().replace(" ", "")
-                replied_user = replied.author
-                reply_target = replied
-
-                # First pass: check each word after stripping punctuation.
-                for word in content.split():
-                    cleaned = word.strip(string.punctuation)
-                    if cleaned in self.alias_to_role:
-                        role_mention = self.alias_to_role[cleaned]
-                        break
-                # Second pass: regex search for any alias as a whole word.
-                if not role_mention:
-                    for alias, role_name in self.alias_to_role.items():
-                        pattern = r'\b' + re.escape(alias) + r'\b'
-                        if re.search(pattern, content):
-                            role_mention = role_name
-                            break
-            except Exception as e:
-                print(f"Error fetching referenced message: {e}")
+                replied = await self.perf.timed("reference", self.references.resolve(ctx.message))
+                if replied is not None:
+                    content = replied.content.lower().replace(" ", "")
+                    replied_user = replied.author
+                    reply_target = replied
+
+                    with self.perf.timer("detect"):
+                        role_mention = games.detect(content)
+                    if role_mention is None:
+                        # Typos, accents and spacing the exact aliases don't cover.
+                        with self.perf.timer("detect.fuzzy"):
+                            fuzzy_match = games.detect_fuzzy(replied.content)
+                        if fuzzy_match is not None:
+                            role_mention = fuzzy_match.role
+                    if self.shadow_enabled:
+                        self.shadow_lfg(ctx.guild, replied.content)
+            except Exception:
+                log.exception("Error fetching referenced message.")
 
         if role_mention is None:
             await self.send_reply(ctx, "No game alias detected in the referenced message.")
             return
 
         # Get the role object.
-        role_obj = discord.utils.get(ctx.guild.roles, name=role_mention)
+        with self.perf.timer("role_resolve"):
+            index = self.guild_index.get(ctx.guild, games)
+            role_obj = index.role(role_mention)
         if role_obj:
             mention_text = f"{role_obj.mention} {replied_user.mention}\n"
-            expected_channel_id = self.role_name_to_channel_id.get(role_obj.name)
+            # Say what a typo or partial name was read as, so a wrong guess is obvious.
+            matched_text = ""
+            if fuzzy_match is not None and fuzzy_match.confidence < 1:
+                matched_text = f"(Read \"{fuzzy_match.query}\" as **{fuzzy_match.alias}**.)\n"
+            expected_channel_id = games.channel_for_role(role_obj.name)
 
             # CASE 1: Correct channel
             if expected_channel_id and ctx.channel.id == expected_channel_id:
                 output = (
-                    f"{mention_text}Looking for a group? Make sure to tag the game you're playing and check out the LFG channels!\n"
+                    f"{mention_text}{matched_text}Looking for a group? Make sure to tag the game you're playing and check out the LFG channels!\n"
                     "📌 [LFG Guide](https://wiki.parentsthatga.me/discord/lfg)"
                 )
-                await reply_target.reply(output)
+                await self.perf.timed("send.reply", reply_target.reply(output))
 
             # CASE 2: Wrong channel
             elif expected_channel_id:
-                target_channel = ctx.guild.get_channel(expected_channel_id)
+                target_channel = index.channel_for_role(role_obj.name)
                 extra_text = (
-                    f"Detected game role: **{role_obj.name}**. This is not the correct channel, "
+                    f"{matched_text}Detected game role: **{role_obj.name}**. This is not the correct channel, "
                     f"we have a dedicated channel here: {target_channel.mention if target_channel else 'Unknown'}.\n"
                     f"Please grab the game-specific role from {self.channels_and_roles_link}."
                 )
-                await reply_target.reply(extra_text)
-
+                # None of these depend on each other, so send them together.
+                steps = {"reply": self.perf.timed("send.reply", reply_target.reply(extra_text))}
                 # Give role if missing
                 if role_obj not in replied_user.roles:
-                    try:
-                        await replied_user.add_roles(role_obj, reason="User redirected by LFG command")
-                    except Exception as e:
-                        print(f"Failed to add role to user: {e}")
-
-                # Also send LFG ping in the right channel
+                    can_assign, why_not = self.capabilities.can_assign(ctx.guild, role_obj)
+                    if can_assign:
+                        steps["add role"] = self.perf.timed(
+                            "add_role", replied_user.add_roles(role_obj, reason="User redirected by LFG command")
+                        )
+                    else:
+                        log.info("Not giving %s the %s role: %s", replied_user, role_obj.name, why_not)
+                # Also send LFG ping in the right channel. It's queued, so a burst of lfg calls
+                # neither waits on that channel's rate limit nor pings the role once per call.
                 if target_channel:
                     lfg_text = (
-                        f"{role_obj.mention} {replied_user.mention}\n"
                         "Looking for a group? Make sure to tag the game you're playing and check out the LFG channels!\n"
                         "📌 [LFG Guide](https://wiki.parentsthatga.me/discord/lfg)"
                     )
-                    try:
-                        await target_channel.send(lfg_text)
-                    except Exception as e:
-                        print(f"Failed to send LFG in proper channel: {e}")
+                    self.outbound.ping(target_channel, role_obj, replied_user, lfg_text)
+                await gather_steps(steps, context="lfg redirect")
             else:
                 # CASE 3: No mapped channel
                 output = (
-                    f"{mention_text}Looking for a group? Make sure to tag the game you're playing and check out the LFG channels!\n"
+                    f"{mention_text}{matched_text}Looking for a group? Make sure to tag the game you're playing and check out the LFG channels!\n"
                     "📌 [LFG Guide](https://wiki.parentsthatga.me/discord/lfg)"
                 )
-                await reply_target.reply(output)
+                await self.perf.timed("send.reply", reply_target.reply(output))
         else:
             await self.send_reply(ctx, f"Could not find role: {role_mention}.")
 
@@ -354,36 +855,14 @@ class Wiki(commands.Cog):
         await self.send_reply(ctx, output)
 
     @commands.command()
-    async def rule(self, ctx, rule_number: int):
+    async def rule(self, ctx, *, query: str):
         """
         📘 Reply to a message and show a quick summary of the selected rule with a link to the full rules page.
-        Use: `-rule 3`
+        Use: `-rule 3`, or a keyword like `-rule invites`
         """
         if not await self.delete_and_check(ctx):
             return
-        rules = {
-            1: "**1️⃣ Be Respectful**\nTreat everyone respectfully. Disrespectful or toxic behavior will result in action.",
-            2: "**2️⃣ 18+ Only**\nPA is for adults only. You must be 18 or older to participate.",
-            3: "**3️⃣ Be Civil & Read the Room**\nAvoid sensitive topics unless everyone is comfortable. No such discussions in text channels.",
-            4: "**4️⃣ NSFW Content Is Not Allowed**\nExplicit, grotesque, or pornographic content will result in a ban.",
-            5: "**5️⃣ Communication - English Preferred**\nPlease speak in English so the whole community can engage.",
-            6: "**6️⃣ Use Channels & Roles Properly**\nUse the correct channels for each topic.\n📌 [Roles How-To](https://wiki.parentsthatga.me/discord/roles)\n📌 [LFG Guide](https://wiki.parentsthatga.me/discord/lfg)",
-            7: "**7️⃣ Promoting Your Own Content**\nPromote in #promote-yourself or #clip-sharing only. Apply in #applications to post on official PA platforms.",
-            8: "**8️⃣ Crowdfunding & Solicitation**\nNo donation or solicitation links allowed. DM spam is not tolerated.",
-            9: "**9️⃣ No Unapproved Invites or Links**\nGame server links require vetting and Discord invites are absolutely not allowed.\n📌 [Host/Advertise](https://wiki.parentsthatga.me/servers/hosting)\n📌 [Apply for Vetting](https://discord.com/channels/629113661113368594/693601096467218523/1349427482637635677)",
-            10: "**🔟 Build-A-VC Channel Names**\nChannel names must be clean and appropriate for Discord Discovery."
-        }
-        rule_text = rules.get(rule_number)
-        if rule_text:
-            embed = discord.Embed(
-                title="Full Rules",
-                url="https://wiki.parentsthatga.me/rules",
-                description=rule_text,
-                color=discord.Color.orange()
-            )
-            await self.send_reply(ctx, embed=embed)
-        else:
-            await self.send_reply(ctx, "Invalid rule number. Use 1–10.")
+        await send_rule(partial(self.send_reply, ctx), self.rules, query)
 
     @commands.command()
     async def wow(self, ctx):
@@ -411,9 +890,8 @@ class Wiki(commands.Cog):
             "If you cannot abide by the rules from previous responses,\n"
             "**Click Below To FAFO**"
         )
-        view = FafoView()
-        msg = await self.send_reply(ctx, warning_text, view=view)
-        view.message = msg
+        msg = await self.send_reply(ctx, warning_text, view=FafoButton.view())
+        await self.fafo_expiry.schedule(msg.channel.id, msg.id, WARNING_LIFETIME)
 
 async def setup(bot):
     await bot.add_cog(Wiki(bot))
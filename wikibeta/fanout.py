@@ -0,0 +1,60 @@
+import asyncio
+import logging
+
+import discord
+
+# Copy of wiki/fanout.py, kept in step with it; see wikibeta_cog.py.
+
+log = logging.getLogger("red.Wikibeta.fanout")
+
+
+async def gather_steps(steps, *, context="command"):
+    """
+    Run independent side effects concurrently and report which ones failed.
+
+    `steps` maps a step name to an awaitable. Every step runs to completion;
+    failures are logged with the step name and returned as {name: exception}.
+    """
+    names = list(steps)
+    results = await asyncio.gather(*steps.values(), return_exceptions=True)
+    failures = {}
+    for name, result in zip(names, results):
+        if isinstance(result, BaseException):
+            failures[name] = result
+            log.warning("%s: step %r failed: %r", context, name, result, exc_info=result)
+    return failures
+
+
+class BackgroundTasks:
+    """
+    Fire-and-forget tasks that are still tracked, logged and cancellable.
+    """
+
+    # Expected outcomes that aren't worth a warning, e.g. a command message
+    # someone else already deleted.
+    quiet_errors = (discord.NotFound, discord.Forbidden)
+
+    def __init__(self):
+        self._tasks = set()
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def spawn(self, coro, name):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(lambda t: self._done(t, name))
+        return task
+
+    def _done(self, task, name):
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None and not isinstance(exc, self.quiet_errors):
+            log.warning("Background step %r failed: %r", name, exc, exc_info=exc)
+
+    def cancel_all(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
@@ -0,0 +1,254 @@
+import logging
+
+from .fuzzy import FuzzyIndex
+from .matcher import AliasMatcher
+
+# Copy of wiki/games.py, kept in step with it; see wikibeta_cog.py.
+
+log = logging.getLogger("red.Wikibeta.games")
+
+# Roles that may invoke the staff helper commands.
+ALLOWED_ROLES = (
+    "Game Server Team", "Advisors", "Wardens", "The Brute Squad", "Sentinels",
+    "Community Manager - Helldivers", "Community Manager - Book Club",
+    "Community Manager - Call of Duty", "Community Manager - D&D",
+    "Community Manager - World of Warcraft", "Community Manager - Minecraft",
+    "Skye", "Librarian Raccoon", "Zara", "BadgerSnacks", "Donnie",
+    "Captain Sawbones", "Captain Soulo"
+)
+
+# Maps common game aliases (all lowercase) to the exact role name.
+ALIAS_TO_ROLE = {
+    "7dtd": "7 Days To Die", "ark": "ARK", "aoe": "Age of Empires", "amongus": "Among Us",
+    "acnh": "Animal Crossing", "apex": "Apex Legends", "assetto": "Assetto Corsa",
+    "b4b": "Back 4 Blood", "bf": "Battlefield", "bg3": "Baldur's Gate 3", "cod": "Call of Duty",
+    "cw": "Content Warning", "dayz": "DayZ", "dbd": "Dead by Daylight", "drg": "Deep Rock Galactic",
+    "demo": "Demonologist", "d2": "Destiny 2", "diablo": "Diablo", "dirt": "DiRT",
+    "ddv": "Disney Dreamlight Valley", "dnd": "Dungeons&Dragons", "d&d": "Dungeons&Dragons",
+    "dungeons": "Dungeons&Dragons", "biweekly": "D&D Biweekly Players", "dragonage": "Dragon Age",
+    "dyinglight": "Dying Light", "eldenring": "Elden Ring", "eso": "Elder Scrolls",
+    "elite": "Elite Dangerous", "enshrouded": "Enshrouded", "eft": "Escape from Tarkov",
+    "tarkov": "Escape from Tarkov", "fallout": "Fallout", "farmingsim": "Farming sim",
+    "ffxiv": "Final Fantasy XIV", "descendant": "The First Descendant", "fivem": "FiveM",
+    "honor": "For Honor", "fn": "Fortnite", "forza": "Forza", "genshin": "Genshin Impact",
+    "recon": "Ghost Recon", "goose": "Goose Goose Duck", "gta": "Grand Theft Auto V",
+    "halo": "Halo", "hll": "Hell Let Loose", "helldivers": "Helldivers 2",
+    "hogwarts": "Hogwarts Legacy", "jackbox": "Jackbox", "lol": "League of Legends",
+    "lethal": "Lethal Company", "lockdown": "Lockdown Protocol", "lostark": "Lost Ark",
+    "mtg": "Magic: The Gathering", "mariokart": "Mario Kart", "marvel": "Marvel Rivals",
+    "mc": "Minecraft", "monsterhunter": "Monster Hunter", "mk": "Mortal Kombat",
+    "nms": "No Man's Sky", "oncehuman": "Once Human", "ow": "Overwatch", "ow2": "Overwatch",
+    "palia": "Palia", "palworld": "Palworld", "poe": "Path of Exile", "pavlov": "Pavlov",
+    "phasmophobia": "Phasmophobia", "pubg": "Player Unknown Battlegrounds",
+    "pokemon": "Pokémon", "raft": "Raft", "rainbow": "Rainbow Six", "r6": "Rainbow Six",
+    "ron": "Ready Or Not", "readyornot": "Ready Or Not", "rdo": "Red Dead: Online", "repo": "R.E.P.O", "rl": "Rocket League",
+    "runescape": "RuneScape", "rust": "Rust", "satisfactory": "Satisfactory",
+    "sot": "Sea of Thieves", "sims": "The Sims", "sm2": "Space Marines 2", "sc": "Star Citizen",
+    "stardew": "Stardew Valley", "starfield": "Starfield", "ssb": "Super Smash Bros.",
+    "division": "The Division", "tinytina": "Tiny Tina's Wonderlands", "trucksim": "Truck Simulator",
+    "valheim": "Valheim", "val": "Valorant", "warframe": "Warframe", "warthunder": "War Thunder",
+    "wot": "World of Tanks", "wow": "World of Warcraft"
+}
+
+# Maps role names to the channel where that game's LFG should happen.
+ROLE_NAME_TO_CHANNEL_ID = {
+    "Escape from Tarkov": 1325558852120350863, #Escape From Tarkov
+    "Table-Top Simulator": 1217529197594021889,
+    "Warhammer 40k": 1217529421863456928,
+    "Elden Ring": 1315179628993839155, #Elden Ring
+    "Baldur's Gate 3": 1315180707685073028, #Baldur's Gate
+    "Final Fantasy": 1328766811671498833,
+    "Assetto Corsa": 1315312906178396180,
+    "League of Legends": 1308589894268092476, #League of Legends
+    "Dota 2": 1308590005911814224,
+    "Smite": 1308590072689590374,
+    "Wild Rift": 1316230560946982942,
+    "iRacing": 1328799846341148672,
+    "Animal Crossing": 1356280246587883551, #Animal Crossing
+    "Age of Empires": 1021071580375302144, #RTS
+    "Among Us": 1187881125813698611, #Party
+    "Apex Legends": 1021071765994209451, #Battle Royale
+    "Back 4 Blood": 1147172129658372239, #FPS
+    "Battlefield": 1147172129658372239,  #FPS
+    "Call of Duty": 1067440688737820683, #COD-General
+    "Content Warning": 1187881125813698611, #Party
+    "DayZ": 934224139181502524, #Survival-Craft
+    "Dead by Daylight": 934226974468112434, #Horror
+    "Deep Rock Galactic": 1147172129658372239, #FPS
+    "Demonologist": 934226974468112434, #Horror
+    "Destiny 2": 1108432769505308702, #The Tower
+    "Diablo": 1123047882669436958, #All Diablo Chat
+    "Disney Dreamlight Valley": 1354469688582602993, #Dreamlight channel
+    "Dungeons&Dragons": 933541913167024189, #The Tavern
+    "D&D Biweekly Players": 1064988631305040063, #Adventurers Guild
+    "Dragon Age": 1215035228364603552, #RPG Games
+    "Dying Light": 934226974468112434, #Horror
+    "Elder Scrolls": 1215035228364603552, #RPG Games
+    "Elite Dangerous": 1021072931947819049, #Space & Flight Games
+    "Enshrouded": 934224139181502524, #Survival-Craft
+    "Fallout": 1215035228364603552, #RPG Games
+    "Farming sim": 1318215079736381460, #Farming Sim
+    "Final Fantasy XIV": 1328766811671498833, #Final Fantasy
+    "The First Descendant": 1147172129658372239, #FPS
+    "FiveM": 1215035228364603552, #RPG Games
+    "For Honor": 1021075894120480818, #Fighting Games
+    "Fortnite": 1316416079333167149, #Fortnite General
+    "Forza": 1328799912892170260, #Forza
+    "Genshin Impact": 1215035228364603552, #RPG Games
+    "Ghost Recon": 1021075269886414849, #third-person shooter
+    "Goose Goose Duck": 1187881125813698611, #Party
+    "Grand Theft Auto V": 1147172129658372239, #FPS
+    "Halo": 1147172129658372239, #FPS
+    "Hell Let Loose": 1325565264246603859, #Hell Let Loose
+    "Helldivers 2": 1215290878973972481, # Helldivers
+    "Hogwarts Legacy": 1215035228364603552, #RPG Games (I'm so lost)
+    "Jackbox": 1187881125813698611, #Party
+    "Lethal Company": 934226974468112434, #Horror
+    "Lockdown Protocol": 1187881125813698611, #Party
+    "Lost Ark": 1215035228364603552, #RPG Games (Maybe? Kind of?)
+    "Magic: The Gathering": 1065493485714686003, #Magic channel
+    "Mario Kart": 1021073264493211739, #Racing Games
+    "Marvel Rivals": 1318214983670042707,
+    "Minecraft": 1109614662594613298, #Minecraft General
+    "Monster Hunter": 1315178720364859402, #Monster Hunter
+    "Mortal Kombat": 1021075894120480818, #Fighting Games
+    "No Man's Sky": 1021072931947819049, #Space & Flight Games
+    "Once Human": 1021075269886414849, #third-person shooter
+    "Overwatch": 1318215028494831697, #Overwatch?
+    "Palia": 1318220176981889187, #Palia
+    "Palworld": 934224139181502524, #Survival-Craft
+    "Path of Exile": 1205575608231530506, #PoE
+    "Phasmophobia": 1328029591062839376, #Phasmophobia
+    "Path of Exile 2": 1310386526093578251, #PoE2
+    "Pavlov": 933461190582091887, #VR
+    "Player Unknown Battlegrounds": 1021071765994209451, #Battle Royale
+    "Pokémon": 1065621451417337956,
+    "Raft": 934224139181502524, #Survival-Craft
+    "Rainbow Six": 1325558740086161428, #Rainbow Six
+    "Ready Or Not": 1325558905907970199, #RoN
+    "Red Dead: Online": 1215035228364603552, #RPG Games
+    "R.E.P.O": 1351009382154109018, #Repo
+    "Rocket League": 1021076388406632468, #Sports
+    "RuneScape": 1215035228364603552, #RPG Games
+    "Rust": 934224139181502524, #Survival-Craft
+    "Satisfactory": 934224139181502524, #Survival-Craft (Cozy games has been argued)
+    "Sea of Thieves": 1215035228364603552, #RPG Games (This is the biggest shot in the dark)
+    "The Sims": 1356280039603437749, #Cozy General
+    "Space Marines 2": 1021075269886414849, #third-person shooter
+    "Star Citizen": 1021072931947819049, #Space & Flight Games
+    "Stardew Valley": 1356280039603437749, #Cozy General
+    "Starfield": 1215035228364603552, #RPG Games
+    "Super Smash Bros.": 1021075894120480818, #Fighting Games
+    "The Division": 1021075269886414849, #third-person shooter
+    "Tiny Tina's Wonderlands": 1147172129658372239, #FPS
+    "Truck Simulator": 1192812670592749710, #Simulation Games
+    "Valheim": 934224139181502524, #Survival-Craft
+    "Valorant": 1147172129658372239, #FPS
+    "Warframe": 1021075269886414849, #third-person shooter
+    "War Thunder": 1325565211884781588,
+    "World of Tanks": 1192812670592749710, #Simulation Games
+    "World of Warcraft": 1067440649479131187 #Wow General
+}
+
+
+def normalize(name):
+    """
+    Casefold and collapse whitespace so lookups don't depend on how a key was typed.
+    """
+    return " ".join(str(name).casefold().split())
+
+
+class GameRegistry:
+    """
+    Normalized, validated view over the alias and channel tables.
+
+    Every lookup is a single dict hit on a normalized key. Problems found
+    while building (aliases whose role has no channel, channel entries no
+    alias points at, keys that collide after normalizing) are kept on the
+    registry and logged once.
+    """
+
+    def __init__(self, alias_to_role=None, role_name_to_channel_id=None):
+        if alias_to_role is None:
+            alias_to_role = ALIAS_TO_ROLE
+        if role_name_to_channel_id is None:
+            role_name_to_channel_id = ROLE_NAME_TO_CHANNEL_ID
+        self.problems = []
+        # normalized role name -> display role name
+        self.roles = {}
+        # normalized role name -> channel id
+        self.channels = {}
+        # normalized alias -> display role name
+        self.aliases = {}
+
+        for role_name, channel_id in role_name_to_channel_id.items():
+            key = normalize(role_name)
+            if key in self.channels and self.channels[key] != channel_id:
+                self.problems.append(
+                    f"Role {role_name!r} is mapped to two channels ({self.channels[key]} and {channel_id})."
+                )
+            self.channels[key] = channel_id
+            self.roles.setdefault(key, " ".join(role_name.split()))
+
+        for alias, role_name in alias_to_role.items():
+            alias_key = normalize(alias)
+            role_key = normalize(role_name)
+            # The alias table is the source of truth for the display name.
+            self.roles[role_key] = " ".join(role_name.split())
+            existing = self.aliases.get(alias_key)
+            if existing is not None and normalize(existing) != role_key:
+                self.problems.append(f"Alias {alias!r} points at both {existing!r} and {role_name!r}.")
+            self.aliases[alias_key] = self.roles[role_key]
+
+        aliased_roles = {normalize(role) for role in self.aliases.values()}
+        self.orphan_aliases = sorted(
+            alias for alias, role in self.aliases.items() if normalize(role) not in self.channels
+        )
+        self.unaliased_channels = sorted(
+            self.roles[key] for key in self.channels if key not in aliased_roles
+        )
+        for alias in self.orphan_aliases:
+            self.problems.append(f"Alias {alias!r} -> {self.aliases[alias]!r} has no channel mapped.")
+        for role_name in self.unaliased_channels:
+            self.problems.append(f"Channel entry {role_name!r} has no alias pointing at it.")
+        if self.problems:
+            log.warning(
+                "Game registry has %d problem(s):\n%s", len(self.problems), "\n".join(self.problems)
+            )
+
+        # Built once; finds every alias in a single scan of the message.
+        self.matcher = AliasMatcher(self.aliases)
+        # Built once too; only consulted when the exact matcher finds nothing.
+        self.fuzzy = FuzzyIndex(self.aliases, set(self.roles.values()))
+        # First word of every alias, for prefilters that want to skip the matcher.
+        self.alias_heads = frozenset(alias.split()[0] for alias in self.aliases if alias.split())
+
+    def role_for_alias(self, alias):
+        """
+        Return the role name an alias maps to, or None.
+        """
+        return self.aliases.get(normalize(alias))
+
+    def canonical_role(self, role_name):
+        """
+        Return the registry's spelling of a role name, or None if it is unknown.
+        """
+        return self.roles.get(normalize(role_name))
+
+    def channel_for_role(self, role_name):
+        """
+        Return the channel ID mapped to a role name, or None.
+        """
+        return self.channels.get(normalize(role_name))
+
+    def detect(self, text):
+        """
+        Return the role name of the best alias found in `text`, or None.
+        """
+        return self.matcher.search(text)
+
+    def detect_fuzzy(self, text):
+        """
+        Return a FuzzyMatch for the closest alias or role name in `text`, or None.
+        """
+        return self.fuzzy.search(text)
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+
+from .games import normalize
+
+# Copy of wiki/guild_index.py, kept in step with it; see wikibeta_cog.py.
+
+
+class GuildIndex:
+    """
+    Role and channel lookups for a single guild, keyed by normalized name.
+
+    Built from the guild's cache in one pass so later lookups are dict hits
+    instead of scans over `guild.roles`.
+    """
+
+    def __init__(self, guild, games):
+        self.guild_id = guild.id
+        self.games = games
+        self.roles_by_name = {}
+        # guild.roles is ordered bottom-up; keep the first role for a name
+        # to match what discord.utils.get used to return.
+        for role in guild.roles:
+            self.roles_by_name.setdefault(normalize(role.name), role)
+        self.channels_by_role = {}
+        for role_key, channel_id in games.channels.items():
+            channel = guild.get_channel(channel_id)
+            if channel is not None:
+                self.channels_by_role[role_key] = channel
+
+    def role(self, role_name):
+        """
+        Return the guild Role with this name, or None.
+        """
+        return self.roles_by_name.get(normalize(role_name))
+
+    def role_for_alias(self, alias):
+        """
+        Return the guild Role an alias maps to, or None.
+        """
+        role_name = self.games.role_for_alias(alias)
+        return self.role(role_name) if role_name else None
+
+    def channel_for_role(self, role_name):
+        """
+        Return the mapped channel object for a role name, or None.
+        """
+        return self.channels_by_role.get(normalize(role_name))
+
+
+class GuildIndexCache:
+    """
+    Lazily built GuildIndex per guild, bounded with LRU eviction.
+
+    Cogs call `invalidate` from their role/channel listeners; the next
+    lookup for that guild rebuilds its index. Passing a different `games`
+    registry to `get` (after the guild's game tables were edited) also
+    rebuilds it.
+    """
+
+    def __init__(self, games, max_guilds=64):
+        self.games = games
+        self.max_guilds = max_guilds
+        self._indexes = OrderedDict()
+
+    def __len__(self):
+        return len(self._indexes)
+
+    def get(self, guild, games=None):
+        """
+        Return the index for `guild` over `games` (default: the cache's registry), building it if needed.
+        """
+        if games is None:
+            games = self.games
+        index = self._indexes.get(guild.id)
+        if index is None or index.games is not games:
+            index = GuildIndex(guild, games)
+            self._indexes[guild.id] = index
+            while len(self._indexes) > self.max_guilds:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(guild.id)
+        return index
+
+    def invalidate(self, guild_id):
+        self._indexes.pop(guild_id, None)
+
+    def clear(self):
+        self._indexes.clear()
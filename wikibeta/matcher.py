@@ -0,0 +1,122 @@
+from collections import deque
+
+# Copy of wiki/matcher.py, kept in step with it; see wikibeta_cog.py.
+
+
+def _is_word_char(ch):
+    """
+    Mirror of the regex `\\w` class used by the old `\\b` patterns.
+    """
+    return ch.isalnum() or ch == "_"
+
+
+class AliasMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of aliases.
+
+    The automaton is built once and then finds every alias occurrence in a
+    single left-to-right scan of the text, so the cost per character does not
+    depend on how many aliases are registered. Occurrences only count when
+    they sit on word boundaries, the same rule the old `\\b<alias>\\b` regex
+    loop applied.
+    """
+
+    def __init__(self, aliases):
+        # aliases: mapping of lowercase alias -> value (usually a role name).
+        self._values = []
+        self._lengths = []
+        # Node 0 is the root. Each node has a goto dict, a failure link and
+        # the alias ids that end exactly there; `_dict_link` points at the
+        # nearest suffix node that also ends an alias.
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._dict_link = [0]
+        for alias, value in aliases.items():
+            self._add(alias.lower(), value)
+        self._build_links()
+
+    def __len__(self):
+        return len(self._values)
+
+    def _add(self, alias, value):
+        if not alias:
+            return
+        node = 0
+        for ch in alias:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._dict_link.append(0)
+            node = nxt
+        alias_id = len(self._values)
+        self._values.append(value)
+        self._lengths.append((len(alias), _is_word_char(alias[0]), _is_word_char(alias[-1])))
+        self._out[node].append(alias_id)
+
+    def _build_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                fail_node = self._fail[child]
+                self._dict_link[child] = fail_node if self._out[fail_node] else self._dict_link[fail_node]
+
+    def find_all(self, text):
+        """
+        Return every word-bounded alias occurrence in `text`.
+
+        Each entry is `(start, end, value)` where `text[start:end]` is the
+        alias, in the order the scan reaches the end of each match.
+        """
+        text = text.lower()
+        goto, fail, out, dict_link = self._goto, self._fail, self._out, self._dict_link
+        matches = []
+        node = 0
+        last = len(text) - 1
+        for end, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = node if out[node] else dict_link[node]
+            while hit:
+                for alias_id in out[hit]:
+                    length, word_start, word_end = self._lengths[alias_id]
+                    start = end - length + 1
+                    before = text[start - 1] if start > 0 else ""
+                    after = text[end + 1] if end < last else ""
+                    if word_start == (before != "" and _is_word_char(before)):
+                        continue
+                    if word_end == (after != "" and _is_word_char(after)):
+                        continue
+                    matches.append((start, end + 1, self._values[alias_id]))
+                hit = dict_link[hit]
+        return matches
+
+    def best(self, text):
+        """
+        Return the winning `(start, end, value)` occurrence, or None.
+
+        Ties are broken by the longest alias first, then the earliest position.
+        """
+        matches = self.find_all(text)
+        if not matches:
+            return None
+        return min(matches, key=lambda m: (m[0] - m[1], m[0]))
+
+    def search(self, text):
+        """
+        Return the value of the best match in `text`, or None.
+        """
+        match = self.best(text)
+        return match[2] if match else None
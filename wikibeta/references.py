@@ -0,0 +1,92 @@
+import time
+from collections import OrderedDict
+
+import discord
+
+# Copy of wiki/references.py, kept in step with it; see wikibeta_cog.py.
+
+
+class ReferenceResolver:
+    """
+    Resolve the message a command replied to with as few REST calls as possible.
+
+    Sources are tried cheapest first: the `resolved` payload Discord sends
+    with the reply, the client's message cache, a small LRU of messages we
+    fetched ourselves, and only then `fetch_message`. Messages that turned
+    out to be deleted or unreadable are remembered for a while so repeat
+    commands don't keep hitting the API for them.
+    """
+
+    def __init__(self, max_messages=128, missing_ttl=300.0):
+        self.max_messages = max_messages
+        self.missing_ttl = missing_ttl
+        self._recent = OrderedDict()
+        self._missing = OrderedDict()
+
+    async def resolve(self, message):
+        """
+        Return the Message that `message` replies to, or None.
+        """
+        ref = message.reference
+        if ref is None or ref.message_id is None:
+            return None
+        message_id = ref.message_id
+
+        resolved = ref.resolved
+        if isinstance(resolved, discord.Message):
+            self._remember(resolved)
+            return resolved
+        if isinstance(resolved, discord.DeletedReferencedMessage):
+            self.mark_missing(message_id)
+            return None
+
+        if self._is_missing(message_id):
+            return None
+
+        cached = ref.cached_message
+        if cached is not None:
+            return cached
+
+        recent = self._recent.get(message_id)
+        if recent is not None:
+            self._recent.move_to_end(message_id)
+            return recent
+
+        try:
+            fetched = await message.channel.fetch_message(message_id)
+        except (discord.NotFound, discord.Forbidden):
+            self.mark_missing(message_id)
+            return None
+        self._remember(fetched)
+        return fetched
+
+    def _remember(self, message):
+        self._recent[message.id] = message
+        self._recent.move_to_end(message.id)
+        while len(self._recent) > self.max_messages:
+            self._recent.popitem(last=False)
+
+    def _is_missing(self, message_id):
+        expires = self._missing.get(message_id)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self._missing[message_id]
+            return False
+        return True
+
+    def mark_missing(self, message_id):
+        """
+        Remember that `message_id` is gone or unreadable.
+        """
+        self._recent.pop(message_id, None)
+        self._missing[message_id] = time.monotonic() + self.missing_ttl
+        self._missing.move_to_end(message_id)
+        while len(self._missing) > self.max_messages:
+            self._missing.popitem(last=False)
+
+    def forget(self, message_id):
+        """
+        Drop any cached copy of `message_id`, e.g. after it was edited.
+        """
+        self._recent.pop(message_id, None)
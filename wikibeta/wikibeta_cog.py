@@ -1,135 +1,142 @@
 import discord
-import string
-import re
-from datetime import datetime, timedelta
-from redbot.core import commands
-
-class FafoView(discord.ui.View):
-    def __init__(self, timeout: int = 180):
-        super().__init__(timeout=timeout)
-        self.message = None  # Stores the message this view is attached to
-
-    async def on_timeout(self):
-        # When the view times out, attempt to delete the message containing it.
-        if self.message:
-            try:
-                await self.message.delete()
-            except Exception as e:
-                print(f"Failed to delete message on timeout: {e}")
-
-    @discord.ui.button(label="FAFO", style=discord.ButtonStyle.danger)
-    async def fafo_button(self, button: discord.ui.Button, interaction: discord.Interaction):
-        """
-        (Beta) Button callback for FAFO.
-        Attempts to timeout the clicking user for 5 minutes using Member.timeout().
-        If the member isn't found, or if permissions/HTTP errors occur, an appropriate message is sent.
-        """
-        await interaction.response.defer(ephemeral=True)
-        try:
-            duration = timedelta(minutes=5)
-            until_time = discord.utils.utcnow() + duration
-            # Ensure interaction.user is a Member object; fallback if not found.
-            member = interaction.guild.get_member(interaction.user.id)
-            if member is None:
-                await interaction.followup.send("Member not found.", ephemeral=True)
-                return
-            await member.timeout(until=until_time, reason="FAFO button clicked.")
-            await interaction.followup.send("You have been timed out for 5 minutes.", ephemeral=True)
-        except discord.Forbidden:
-            await interaction.followup.send(
-                "I don't have permission to timeout you. Please check my role position and permissions.",
-                ephemeral=True)
-        except discord.HTTPException as e:
-            await interaction.followup.send(f"An error occurred while attempting to timeout: {e}", ephemeral=True)
+import logging
+import time
+from functools import partial
+from redbot.core import Config, commands
+
+# Red loads cogs in its saved order and drops any that fail from autoload, so
+# this cog can't rely on `wiki` being imported first. The helpers it shares
+# with the wiki cog are copies in this package; the wiki cog itself is only
+# looked up at runtime, through `bot.get_cog("Wiki")`.
+from .auth import RoleAuthorizer
+from .capabilities import CapabilityCache
+from .fafo import WARNING_LIFETIME, ExpiryScheduler, FafoBatcher, FafoButton
+from .fanout import BackgroundTasks, gather_steps
+from .games import ALLOWED_ROLES, GameRegistry
+from .guild_index import GuildIndexCache
+from .perf import PerfRegistry
+from .references import ReferenceResolver
+from .rules import RuleBook, send_rule
+
+log = logging.getLogger("red.Wikibeta")
+
+
+class BetaFafoButton(FafoButton, template=r"wikibeta:fafo"):
+    cog_name = "Wikibeta"
+
 
 class Wikibeta(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        # Allowed roles for invoking beta commands.
-        self.allowed_roles = [
-            "Game Server Team", "Advisors", "Wardens", "The Brute Squad", "Sentinels",
-            "Community Manager - Helldivers", "Community Manager - Book Club",
-            "Community Manager - Call of Duty", "Community Manager - D&D",
-            "Community Manager - World of Warcraft", "Community Manager - Minecraft",
-            "Skye", "Librarian Raccoon", "Zara", "BadgerSnacks", "Donnie",
-            "Captain Sawbones", "Captain Soulo"
-        ]
-        # Maps common game aliases (all lowercase) to the exact role name.
-        self.alias_to_role = {
-            "7dtd": "7 Days To Die", "ark": "ARK", "aoe": "Age of Empires", "amongus": "Among Us",
-            "acnh": "Animal Crossing", "apex": "Apex Legends", "assetto": "Assetto Corsa",
-            "b4b": "Back 4 Blood", "bf": "Battlefield", "bg3": "Baldur's Gate 3", "cod": "Call of Duty",
-            "cw": "Content Warning", "dayz": "DayZ", "dbd": "Dead by Daylight", "drg": "Deep Rock Galactic",
-            "demo": "Demonologist", "d2": "Destiny 2", "diablo": "Diablo", "dirt": "DiRT",
-            "ddv": "Disney Dreamlight Valley", "dnd": "Dungeons&Dragons", "d&d": "Dungeons&Dragons",
-            "dungeons": "Dungeons&Dragons", "biweekly": "D&D Biweekly Players", "dragonage": "Dragon Age",
-            "dyinglight": "Dying Light", "eldenring": "Elden Ring", "eso": "Elder Scrolls",
-            "elite": "Elite Dangerous", "enshrouded": "Enshrouded", "eft": "Escape from Tarkov",
-            "tarkov": "Escape from Tarkov", "fallout": "Fallout", "farmingsim": "Farming sim",
-            "ffxiv": "Final Fantasy XIV", "descendant": "The First Descendant", "fivem": "FiveM",
-            "honor": "For Honor", "fn": "Fortnite", "forza": "Forza", "genshin": "Genshin Impact",
-            "recon": "Ghost Recon", "goose": "Goose Goose Duck", "gta": "Grand Theft Auto V",
-            "halo": "Halo", "hll": "Hell Let Loose", "helldivers": "Helldivers 2",
-            "hogwarts": "Hogwarts Legacy", "jackbox": "Jackbox", "lol": "League of Legends",
-            "lethal": "Lethal Company", "lockdown": "Lockdown Protocol", "lostark": "Lost Ark",
-            "mtg": "Magic: The Gathering", "mariokart": "Mario Kart", "marvel": "Marvel Rivals",
-            "mc": "Minecraft", "monsterhunter": "Monster Hunter", "mk": "Mortal Kombat",
-            "nms": "No Man's Sky", "oncehuman": "Once Human", "ow": "Overwatch", "ow2": "Overwatch",
-            "palia": "Palia", "palworld": "Palworld", "poe": "Path of Exile", "pavlov": "Pavlov",
-            "phasmophobia": "Phasmophobia", "pubg": "Player Unknown Battlegrounds",
-            "pokemon": "Pokémon", "raft": "Raft", "rainbow": "Rainbow Six", "r6": "Rainbow Six",
-            "ron": "Ready Or Not", "rdo": "Red Dead: Online", "repo": "R.E.P.O", "rl": "Rocket League",
-            "runescape": "RuneScape", "rust": "Rust", "satisfactory": "Satisfactory",
-            "sot": "Sea of Thieves", "sims": "The Sims", "sm2": "Space Marines 2", "sc": "Star Citizen",
-            "stardew": "Stardew Valley", "starfield": "Starfield", "ssb": "Super Smash Bros.",
-            "division": "The Division", "tinytina": "Tiny Tina's Wonderlands", "trucksim": "Truck Simulator",
-            "valheim": "Valheim", "val": "Valorant", "warframe": "Warframe", "warthunder": "War Thunder",
-            "wot": "World of Tanks", "wow": "World of Warcraft"
-        }
-        # Mapping from role names to designated channel IDs (use actual channel IDs).
-        self.role_name_to_channel_id = {
-            "Escape from Tarkov": 1325558852120350863,
-            "Hell Let Loose": 1325565264246603859,
-            "Rainbow Six": 1325558740086161428,
-            "Ready Or Not": 1325558905907970199,
-            "War Thunder": 1325565211884781588,
-            "Magic: The Gathering": 1065493485714686003,
-            "Pokémon": 1065621451417337956,
-            "Table-Top Simulator": 1217529197594021889,
-            "Warhammer 40k": 1217529421863456928,
-            "Diablo": 1123047882669436958,
-            "Path of Exile": 1205575608231530506,
-            "Path of Exile 2": 1310386526093578251,
-            "Elden Ring": 1315179628993839155,
-            "Baldur's Gate 3": 1315180707685073028,
-            "Monster Hunter": 1315178720364859402,
-            "Final Fantasy": 1328766811671498833,
-            "Assetto Corsa": 1315312906178396180,
-            "League of Legends": 1308589894268092476,
-            "Dota 2": 1308590005911814224,
-            "Smite": 1308590072689590374,
-            "Marvel Rivals": 1318214983670042707,
-            "Overwatch": 1318215028494831697,
-            "Phasmophobia": 1328029591062839376,
-            "R.E.P.O": 1351009382154109018,
-            "Wild Rift": 1316230560946982942,
-            "iRacing": 1328799846341148672,
-            "Fortnite": 1316416079333167149,
-            "Forza": 1328799912892170260
-        }
+        self.config = Config.get_conf(self, identifier=274661291, force_registration=True)
+        self.config.register_guild(allowed_role_ids=None)
+        self.config.register_global(fafo_expiry=[])
+        # Allowed roles are resolved to role IDs per guild; verdicts are cached per member.
+        self.auth = RoleAuthorizer(self.config, ALLOWED_ROLES)
+        # Built-in alias/channel tables with normalized lookups; `games_for` prefers the wiki cog's per-guild ones.
+        self.games = GameRegistry()
+        # Per-guild role/channel lookups, rebuilt when roles or channels change.
+        self.guild_index = GuildIndexCache(self.games)
+        # Finds replied-to messages from the payload or caches before using REST.
+        self.references = ReferenceResolver()
+        # Side effects nobody waits on, such as deleting the command message.
+        self.background = BackgroundTasks()
+        # What the bot may do per guild, checked locally before role and timeout requests.
+        self.capabilities = CapabilityCache()
+        # FAFO clicks (routed here by BetaFafoButton's custom_id) handled in paced per-guild batches,
+        # and one task that deletes expired warnings.
+        self.fafo_batcher = FafoBatcher(capabilities=self.capabilities)
+        self.fafo_expiry = ExpiryScheduler(bot, self.config.fafo_expiry)
+        # Latency histograms per command phase; the wiki cog's perfstats shows them.
+        self.perf = PerfRegistry("wikibeta")
+        # Built-in rule embeds and keyword index, for when the wiki cog isn't loaded.
+        self.rules = RuleBook()
         # Use Discord's internal format for the Channels & Roles clickable link.
         self.channels_and_roles_link = "<id:customize>"
 
+    async def cog_load(self):
+        self.bot.add_dynamic_items(BetaFafoButton)
+        await self.fafo_expiry.start()
+
+    def cog_unload(self):
+        self.bot.remove_dynamic_items(BetaFafoButton)
+        self.fafo_expiry.stop()
+        self.fafo_batcher.cancel_all()
+        self.background.cancel_all()
+
+    async def cog_before_invoke(self, ctx):
+        ctx.perf_started = time.perf_counter()
+
+    async def cog_after_invoke(self, ctx):
+        started = getattr(ctx, "perf_started", None)
+        if started is not None:
+            self.perf.observe(f"cmd.{ctx.command.qualified_name}", time.perf_counter() - started)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        self.guild_index.invalidate(role.guild.id)
+        self.capabilities.invalidate(role.guild.id)
+        self.auth.roles_changed(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        self.guild_index.invalidate(after.guild.id)
+        self.capabilities.invalidate(after.guild.id)
+        self.auth.roles_changed(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self.guild_index.invalidate(role.guild.id)
+        self.capabilities.invalidate(role.guild.id)
+        self.auth.invalidate_guild(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if before.roles != after.roles:
+            self.auth.invalidate_member(after.guild.id, after.id)
+            if after.id == self.bot.user.id:
+                self.capabilities.invalidate(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before, after):
+        # Ownership transfers change who can be timed out.
+        self.capabilities.invalidate(after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self.guild_index.invalidate(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        self.guild_index.invalidate(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.guild_index.invalidate(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        self.references.mark_missing(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload):
+        self.references.forget(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.guild_index.invalidate(guild.id)
+        self.capabilities.invalidate(guild.id)
+        self.auth.invalidate_guild(guild.id)
+
     async def delete_and_check(self, ctx):
         """
         Delete the invoking message and return True if the user is authorized.
+        The delete runs in the background so the command doesn't wait on it.
         """
-        try:
-            await ctx.message.delete()
-        except discord.Forbidden:
-            pass
-        if not any(role.name in self.allowed_roles for role in ctx.author.roles):
-            return False
+        self.background.spawn(self.perf.timed("delete", ctx.message.delete()), "delete command message")
+        with self.perf.timer("auth"):
+            if ctx.guild is None or not await self.auth.is_authorized(ctx.author):
+                return False
         return True
 
     async def send_reply(self, ctx, *args, **kwargs):
@@ -140,14 +147,138 @@ class Wikibeta(commands.Cog):
         """
         if ctx.message.reference:
             try:
-                original_message = await ctx.channel.fetch_message(ctx.message.reference.message_id)
-                msg = await original_message.reply(*args, **kwargs)
-                return msg
+                original_message = await self.perf.timed("reference", self.references.resolve(ctx.message))
+                if original_message is not None:
+                    msg = await self.perf.timed("send.reply", original_message.reply(*args, **kwargs))
+                    return msg
             except Exception:
                 pass
-        msg = await ctx.send(*args, **kwargs)
+        msg = await self.perf.timed("send.channel", ctx.send(*args, **kwargs))
         return msg
 
+    async def send_replies(self, ctx, *texts):
+        """
+        Send several replies one after another, in order.
+        """
+        for text in texts:
+            await self.send_reply(ctx, text)
+
+    @commands.group(name="betaallow")
+    @commands.guild_only()
+    @commands.is_owner()
+    async def betaallow(self, ctx):
+        """
+        🔐 Show or edit which roles may use the beta wiki commands in this server.
+        """
+        if ctx.invoked_subcommand is None:
+            await ctx.send_help()
+
+    @betaallow.command(name="list")
+    async def betaallow_list(self, ctx):
+        """
+        List the roles currently allowed to use the beta wiki commands.
+        """
+        allowed = await self.auth.allowed_ids(ctx.guild)
+        if not allowed:
+            await ctx.send("No roles are allowed yet.")
+            return
+        lines = []
+        for role_id in sorted(allowed):
+            role = ctx.guild.get_role(role_id)
+            lines.append(f"- {role.name} (`{role_id}`)" if role else f"- Deleted role (`{role_id}`)")
+        await ctx.send("Allowed roles:\n" + "\n".join(lines))
+
+    @betaallow.command(name="add")
+    async def betaallow_add(self, ctx, *, role: discord.Role):
+        """
+        Allow a role to use the beta wiki commands.
+        """
+        allowed = await self.auth.allowed_ids(ctx.guild)
+        await self.auth.set_allowed(ctx.guild, allowed | {role.id})
+        await ctx.send(f"**{role.name}** can now use the beta wiki commands.")
+
+    @betaallow.command(name="remove")
+    async def betaallow_remove(self, ctx, *, role: discord.Role):
+        """
+        Stop a role from using the beta wiki commands.
+        """
+        allowed = await self.auth.allowed_ids(ctx.guild)
+        await self.auth.set_allowed(ctx.guild, allowed - {role.id})
+        await ctx.send(f"**{role.name}** can no longer use the beta wiki commands.")
+
+    @betaallow.command(name="reset")
+    async def betaallow_reset(self, ctx):
+        """
+        Go back to the default staff role list.
+        """
+        await self.auth.reset(ctx.guild)
+        await ctx.send("Allowed roles reset to the defaults.")
+
+    @commands.command(name="betacaps")
+    @commands.guild_only()
+    @commands.is_owner()
+    async def betacaps(self, ctx):
+        """
+        🩺 Show what the bot may do here: role and timeout permissions, and game roles it can't hand out.
+        """
+        self.capabilities.invalidate(ctx.guild.id)
+        caps = self.capabilities.get(ctx.guild)
+        if not caps.known:
+            await ctx.send("My member isn't cached in this server yet; try again in a moment.")
+            return
+        yes_no = {True: "✅", False: "❌"}
+        lines = [
+            f"{yes_no[caps.manage_roles]} Manage Roles",
+            f"{yes_no[caps.moderate_members]} Moderate Members (FAFO timeouts)",
+            f"Top role: **{caps.top_role_name}** (position {caps.top_position})",
+        ]
+        games = self.games_for(ctx.guild)
+        index = self.guild_index.get(ctx.guild, games)
+        blocked = []
+        for role_name in sorted(set(games.roles.values())):
+            role = index.role(role_name)
+            if role is None:
+                continue
+            ok, why_not = caps.can_assign(role)
+            if not ok:
+                blocked.append(f"- {why_not}")
+        if blocked:
+            lines.append(f"Game roles I can't give out ({len(blocked)}):")
+            lines.extend(blocked[:20])
+            if len(blocked) > 20:
+                lines.append(f"...and {len(blocked) - 20} more.")
+        else:
+            lines.append("I can give out every game role.")
+        denied = self.capabilities.denied
+        lines.append(f"Requests skipped by pre-flight checks: {denied['add role']} role adds, {denied['timeout']} timeouts.")
+        await ctx.send("\n".join(lines))
+
+    def games_for(self, guild):
+        """
+        Return the game registry in effect for `guild`: the wiki cog's, with any
+        per-guild edits, when it is loaded, otherwise the built-in tables.
+        """
+        wiki = self.bot.get_cog("Wiki")
+        game_maps = getattr(wiki, "game_maps", None)
+        if game_maps is None:
+            return self.games
+        return game_maps.get(guild)
+
+    def detect_lfg(self, guild, content, games=None):
+        """
+        Return the `(role name, channel id)` betalfg would pick for `content`, without sending anything.
+        The wiki cog's shadow mode calls this on every real lfg, passing the registry it used itself.
+        """
+        if games is None:
+            games = self.games_for(guild)
+        role_name = games.detect(content.lower())
+        if role_name is None:
+            return None, None
+        role = self.guild_index.get(guild, games).role(role_name)
+        if role is None:
+            return role_name, None
+        return role.name, games.channel_for_role(role.name)
+
     @commands.command(name="betalfg")
     async def lfg(self, ctx):
         """
@@ -158,6 +289,7 @@ class Wikibeta(commands.Cog):
         if not await self.delete_and_check(ctx):
             return
 
+        games = self.games_for(ctx.guild)
         role_mention = None
         mention_text = ""
         extra_text = ""
@@ -165,21 +297,11 @@ class Wikibeta(commands.Cog):
         # Attempt to get role info from the referenced message.
         if ctx.message.reference:
             try:
-                replied = await ctx.channel.fetch_message(ctx.message.reference.message_id)
-                content = replied.content.lower()
-                # First pass: check each word after stripping punctuation.
-                for word in content.split():
-                    cleaned = word.strip(string.punctuation)
-                    if cleaned in self.alias_to_role:
-                        role_mention = self.alias_to_role[cleaned]
-                        break
-                # Second pass: regex search for any alias as a whole word.
-                if not role_mention:
-                    for alias, role_name in self.alias_to_role.items():
-                        pattern = r'\b' + re.escape(alias) + r'\b'
-                        if re.search(pattern, content):
-                            role_mention = role_name
-                            break
+                replied = await self.perf.timed("reference", self.references.resolve(ctx.message))
+                if replied is not None:
+                    content = replied.content.lower()
+                    with self.perf.timer("detect"):
+                        role_mention = games.detect(content)
             except Exception:
                 pass
 
@@ -188,11 +310,13 @@ class Wikibeta(commands.Cog):
             return
 
         # Get the role object.
-        role_obj = discord.utils.get(ctx.guild.roles, name=role_mention)
+        with self.perf.timer("role_resolve"):
+            index = self.guild_index.get(ctx.guild, games)
+            role_obj = index.role(role_mention)
         if role_obj:
             # Default: ping both the role and the user.
             mention_text = f"{role_obj.mention} {ctx.author.mention}\n"
-            expected_channel_id = self.role_name_to_channel_id.get(role_obj.name)
+            expected_channel_id = games.channel_for_role(role_obj.name)
             if expected_channel_id:
                 if ctx.channel.id == expected_channel_id:
                     # Correct channel: send message in current channel.
@@ -207,27 +331,31 @@ class Wikibeta(commands.Cog):
                         f"Detected game role: **{role_obj.name}**. This is not the correct channel. "
                         f"Please grab the game-specific role from {self.channels_and_roles_link}.\n"
                     )
-                    await self.send_reply(ctx, extra_text)
+                    target_channel = index.channel_for_role(role_obj.name)
+                    # None of these depend on each other, so send them together. A missing-channel
+                    # notice only makes sense after the reply, so it rides in the same step.
+                    if target_channel:
+                        steps = {"reply": self.send_reply(ctx, extra_text)}
+                    else:
+                        steps = {"reply": self.send_replies(ctx, extra_text, "Error: Designated channel not found.")}
                     # If the user doesn't have the role, assign it.
                     if role_obj not in ctx.author.roles:
-                        try:
-                            await ctx.author.add_roles(role_obj, reason="User redirected by betalfg command")
-                        except Exception as e:
-                            print(f"Failed to add role to user: {e}")
+                        can_assign, why_not = self.capabilities.can_assign(ctx.guild, role_obj)
+                        if can_assign:
+                            steps["add role"] = self.perf.timed(
+                                "add_role", ctx.author.add_roles(role_obj, reason="User redirected by betalfg command")
+                            )
+                        else:
+                            log.info("Not giving %s the %s role: %s", ctx.author, role_obj.name, why_not)
                     # Now, in the correct channel, send the LFG message.
-                    target_channel = ctx.guild.get_channel(expected_channel_id)
                     if target_channel:
                         output = (
                             f"{role_obj.mention} {ctx.author.mention}\n"
                             "Looking for a group? Make sure to tag the game you're playing and check out the LFG channels!\n"
                             "📌 [LFG Guide](https://wiki.parentsthatga.me/discord/lfg)"
                         )
-                        try:
-                            await target_channel.send(output)
-                        except Exception as e:
-                            print(f"Failed to send message in target channel: {e}")
-                    else:
-                        await self.send_reply(ctx, "Error: Designated channel not found.")
+                        steps["lfg ping"] = self.perf.timed("send.lfg_ping", target_channel.send(output))
+                    await gather_steps(steps, context="betalfg redirect")
             else:
                 # No designated channel mapped: proceed as usual.
                 output = (
@@ -265,36 +393,17 @@ class Wikibeta(commands.Cog):
         await self.send_reply(ctx, output)
 
     @commands.command(name="betarule")
-    async def rule(self, ctx, rule_number: int):
+    async def rule(self, ctx, *, query: str):
         """
         📘 (Beta) Reply to a message and show a quick summary of the selected rule with a link to the full rules page.
-        Use: `-betarule 3`
+        Use: `-betarule 3`, or a keyword like `-betarule invites`
         """
         if not await self.delete_and_check(ctx):
             return
-        rules = {
-            1: "**1️⃣ Be Respectful**\nTreat everyone respectfully. Disrespectful or toxic behavior will result in action.",
-            2: "**2️⃣ 18+ Only**\nPA is for adults only. You must be 18 or older to participate.",
-            3: "**3️⃣ Be Civil & Read the Room**\nAvoid sensitive topics unless everyone is comfortable. No such discussions in text channels.",
-            4: "**4️⃣ NSFW Content Is Not Allowed**\nExplicit, grotesque, or pornographic content will result in a ban.",
-            5: "**5️⃣ Communication - English Preferred**\nPlease speak in English so the whole community can engage.",
-            6: "**6️⃣ Use Channels & Roles Properly**\nUse the correct channels for each topic.\n📌 [Roles How-To](https://wiki.parentsthatga.me/discord/roles)\n📌 [LFG Guide](https://wiki.parentsthatga.me/discord/lfg)",
-            7: "**7️⃣ Promoting Your Own Content**\nPromote in #promote-yourself or #clip-sharing only. Apply in #applications to post on official PA platforms.",
-            8: "**8️⃣ Crowdfunding & Solicitation**\nNo donation or solicitation links allowed. DM spam is not tolerated.",
-            9: "**9️⃣ No Unapproved Invites or Links**\nGame server links require vetting and Discord invites are absolutely not allowed.\n📌 [Host/Advertise](https://wiki.parentsthatga.me/servers/hosting)\n📌 [Apply for Vetting](https://discord.com/channels/629113661113368594/693601096467218523/1349427482637635677)",
-            10: "**🔟 Build-A-VC Channel Names**\nChannel names must be clean and appropriate for Discord Discovery."
-        }
-        rule_text = rules.get(rule_number)
-        if rule_text:
-            embed = discord.Embed(
-                title="Full Rules",
-                url="https://wiki.parentsthatga.me/rules",
-                description=rule_text,
-                color=discord.Color.orange()
-            )
-            await self.send_reply(ctx, embed=embed)
-        else:
-            await self.send_reply(ctx, "Invalid rule number. Use 1–10.")
+        # The wiki cog's book carries the staff's rule text edits; the built-in one is only a fallback.
+        wiki = self.bot.get_cog("Wiki")
+        rules = wiki.rules if wiki is not None else self.rules
+        await send_rule(partial(self.send_reply, ctx), rules, query)
 
     @commands.command(name="betawow")
     async def wow(self, ctx):
@@ -321,9 +430,8 @@ class Wikibeta(commands.Cog):
             "Warning: If you cannot abide by the rules from previous responses, "
             "Click Below To FAFO"
         )
-        view = FafoView()
-        msg = await self.send_reply(ctx, warning_text, view=view)
-        view.message = msg
+        msg = await self.send_reply(ctx, warning_text, view=BetaFafoButton.view())
+        await self.fafo_expiry.schedule(msg.channel.id, msg.id, WARNING_LIFETIME)
 
 async def setup(bot):
     await bot.add_cog(Wikibeta(bot))